@@ -1,151 +1,583 @@
 """Database utilities for async SQLite."""
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+import sqlite3
+import weakref
+from contextlib import AsyncExitStack, asynccontextmanager
 from pathlib import Path
 
 import aiosqlite
+import orjson
+from aiosqlitepool import SQLiteConnectionPool
 
 from config import get_settings
 
+logger = logging.getLogger(__name__)
+
 DB_PATH = Path(get_settings().DATABASE_PATH)
+POOL_SIZE = get_settings().DB_POOL_SIZE
+PAGE_SIZE = 16384
+STATEMENT_CACHE_SIZE = 512
+
+
+def _memory_uri(path: str) -> str | None:
+    """Return a shared-cache URI if DATABASE_PATH selects an in-memory DB."""
+    if path == ":memory:":
+        return "file:fraud_agent?mode=memory&cache=shared"
+    if path.startswith("file:") and "mode=memory" in path:
+        return path
+    return None
+
+
+# In-memory mode (DATABASE_PATH=":memory:" or a "file:...?mode=memory&cache=shared"
+# URI) skips all fsync cost for tests and benchmarks. Every pooled connection
+# opens the same shared-cache database; it is destroyed when the last
+# connection closes, so _memory_anchor holds one open for the process lifetime.
+MEMORY_URI = _memory_uri(get_settings().DATABASE_PATH)
+_memory_anchor: sqlite3.Connection | None = None
+
+# Connection target, resolved once at import instead of on every connect.
+DB_URI = MEMORY_URI or f"{DB_PATH.resolve().as_uri()}?mode=rwc"
+
+# Stored in PRAGMA user_version once init_db_tables() has brought a database
+# up to date. Bump whenever the DDL, migrations or _INDEXES change.
+CURRENT_SCHEMA_VERSION = 14
+
+# Long-lived connections keep SQLite's page cache warm across requests
+# and remove per-request connect/close overhead.
+_pool: SQLiteConnectionPool | None = None
+_pool_loop: asyncio.AbstractEventLoop | None = None
+# Physical connections opened for the current pool, held weakly so ones the
+# pool retires drop out once released. When the event loop changes the pool
+# is replaced and the rest are closed directly (the old pool's own close()
+# is bound to the loop that created it).
+_pool_connections: weakref.WeakSet[aiosqlite.Connection] = weakref.WeakSet()
+_retiring: set[asyncio.Task] = set()
+
+
+async def _connect() -> aiosqlite.Connection:
+    """Open a physical connection (PRAGMAs run once per connection, not per request)."""
+    # A larger prepared-statement cache: pooled connections are long-lived,
+    # so every distinct query in the app stays compiled after first use.
+    db = await aiosqlite.connect(DB_URI, uri=True, cached_statements=STATEMENT_CACHE_SIZE)
+    # journal_mode=WAL is persistent in the DB file (set in init_db_tables);
+    # these settings are per-connection and must be applied on every open.
+    # busy_timeout makes concurrent writers wait instead of raising
+    # "database is locked"; mmap_size serves B-tree pages without read() calls.
+    # One executescript = one hop through the aiosqlite worker thread.
+    await db.executescript("""
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA busy_timeout=30000;
+        PRAGMA mmap_size=268435456;
+        PRAGMA cache_size=-131072;
+    """)
+    _pool_connections.add(db)
+    return db
+
+
+async def _close_connections(connections: list[aiosqlite.Connection]) -> None:
+    """Close a replaced pool's connections and stop their worker threads."""
+    results = await asyncio.gather(*(db.close() for db in connections), return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning("Failed to close a stale pooled connection: %s", result)
+
+
+_ORJSON_OPTS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def to_json(value) -> str:
+    """Serialize a value for a JSON TEXT column.
+
+    orjson output is compact (smaller rows, more of them per B-tree page)
+    and accepts the numpy scalars that model features/metrics contain.
+    """
+    return orjson.dumps(value, option=_ORJSON_OPTS).decode()
+
+
+# Shared by every metric snapshot writer so they hit one cached statement
+SNAPSHOT_INSERT_SQL = """
+    INSERT INTO metric_snapshots (snapshot_id, timestamp, model_version, metrics)
+    VALUES (?, ?, ?, ?)"""
+
+
+def _get_pool() -> SQLiteConnectionPool:
+    """Get the connection pool, creating it lazily on first use.
+
+    The pool's asyncio primitives belong to the event loop that created it,
+    so a fresh pool is built when called from a different loop (e.g. tests).
+    """
+    global _pool, _pool_loop, _pool_connections, _memory_anchor
+    loop = asyncio.get_running_loop()
+    if MEMORY_URI and _memory_anchor is None:
+        _memory_anchor = sqlite3.connect(MEMORY_URI, uri=True, check_same_thread=False)
+    if _pool is None or _pool_loop is not loop:
+        if _pool_connections:
+            # Close the replaced pool's connections on this loop; aiosqlite
+            # resolves each close on the loop that awaits it.
+            stale, _pool_connections = list(_pool_connections), weakref.WeakSet()
+            task = loop.create_task(_close_connections(stale))
+            _retiring.add(task)
+            task.add_done_callback(_retiring.discard)
+        _pool = SQLiteConnectionPool(_connect, pool_size=POOL_SIZE)
+        _pool_loop = loop
+    return _pool
 
 
 @asynccontextmanager
 async def get_db():
-    """Get async database connection."""
-    db = await aiosqlite.connect(DB_PATH)
-    # WAL mode gives better concurrent read/write performance
-    await db.execute("PRAGMA journal_mode=WAL")
-    await db.execute("PRAGMA synchronous=NORMAL")
+    """Borrow a pooled database connection."""
+    async with _get_pool().connection() as db:
+        try:
+            yield db
+        except BaseException:
+            # Never hand a connection with a half-finished transaction back to the pool
+            await db.rollback()
+            raise
+
+
+async def fetch_one(db, sql: str, params=()) -> tuple | None:
+    """Run a query and return its first row, or None.
+
+    execute_fetchall runs the statement and fetch in one trip to the
+    connection's thread, where execute() + fetchone() take two. Meant for
+    lookups that return a single row.
+    """
+    rows = await db.execute_fetchall(sql, params)
+    return rows[0] if rows else None
+
+
+async def open_pool() -> SQLiteConnectionPool:
+    """Create the pool and open all POOL_SIZE connections up front.
+
+    Called from the app lifespan so the first requests don't pay for
+    connecting and running the per-connection PRAGMAs.
+    """
+    pool = _get_pool()
+    async with AsyncExitStack() as stack:
+        for _ in range(POOL_SIZE):
+            await stack.enter_async_context(pool.connection())
+    return pool
+
+
+async def close_db():
+    """Close all pooled connections (call on app shutdown)."""
+    global _pool, _pool_loop, _pool_connections
+    if _pool is not None:
+        await _pool.close()
+    # Anything the pool didn't close itself, plus closes of replaced pools
+    # still running on this loop
+    stale, _pool_connections = list(_pool_connections), weakref.WeakSet()
+    await _close_connections(stale)
+    loop = asyncio.get_running_loop()
+    pending = [task for task in _retiring if task.get_loop() is loop]
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+    _pool = None
+    _pool_loop = None
+
+
+# Index definitions keyed by name. Kept out of the CREATE TABLE script so
+# that a changed definition is rebuilt on existing databases
+# (CREATE INDEX IF NOT EXISTS alone would silently keep the old one).
+_INDEXES: dict[str, str] = {
+    # Velocity indexes (critical for scoring performance). They cover every
+    # column the velocity queries read, so matches never touch the table rows.
+    # Timestamps are stored newest-first to match "most recent" scans.
+    "idx_txn_sender_ts": "ON transactions(sender_id, ts_epoch DESC, amount, receiver_id)",
+    "idx_txn_receiver_ts": "ON transactions(receiver_id, ts_epoch DESC, amount, sender_id)",
+    "idx_txn_pair_ts": "ON transactions(sender_id, receiver_id, ts_epoch DESC)",
+    # device_id / ip_address are optional; NULL rows are never looked up
+    "idx_txn_device_ts": "ON transactions(device_id, ts_epoch DESC, sender_id) WHERE device_id IS NOT NULL",
+    "idx_txn_ip_ts": "ON transactions(ip_address, ts_epoch DESC, sender_id) WHERE ip_address IS NOT NULL",
+    "idx_agent_decisions_ts": "ON agent_decisions(timestamp DESC)",
+    # Foreign-key style columns used by joins (transactions LEFT JOIN cases,
+    # analyst_labels JOIN transactions) and per-case label lookups
+    "idx_cases_txn_id": "ON cases(txn_id)",
+    "idx_labels_txn_id": "ON analyst_labels(txn_id)",
+    "idx_labels_case_id": "ON analyst_labels(case_id)",
+    "idx_tpm_txn": "ON txn_pattern_matches(txn_id)",
+    # Retrain / metrics join: labeled decisions -> their transactions
+    "idx_labels_decision_txn": "ON analyst_labels(decision, txn_id)",
+    # Case queues: newest first, overall and per status. Leading on status
+    # alone would be low-selectivity; with created_at it serves the ordered scan.
+    "idx_cases_created": "ON cases(created_at DESC)",
+    "idx_cases_status_created": "ON cases(status, created_at DESC)",
+    # Snapshot trend chart and the guardian's last-retrain lookup
+    "idx_snapshots_ts": "ON metric_snapshots(timestamp)",
+    # Partial index instead of a low-selectivity flagged index: it only
+    # holds the hot rows, so the planner can't misuse it
+    "idx_risk_flagged": "ON risk_results(timestamp) WHERE flagged = 1",
+    # Active pattern cards (feature lookup, related-pattern search)
+    "idx_patterns_active": "ON pattern_cards(discovered_at DESC) WHERE status = 'active'",
+    # Mining dedup reads the active signatures straight off this index
+    "idx_patterns_sig": "ON pattern_cards(structural_sig) WHERE status = 'active'",
+}
+
+# Indexes removed from the schema; dropped from existing databases.
+# idx_txn_receiver / idx_txn_sender_receiver are prefixes of (or served by)
+# the compound receiver/sender timestamp indexes; idx_cases_open is covered
+# by idx_cases_status_created.
+_DROPPED_INDEXES = (
+    "idx_cases_open",
+    "idx_cases_status",
+    "idx_risk_results_flagged",
+    "idx_txn_receiver",
+    "idx_txn_sender_receiver",
+)
+
+
+async def _sync_indexes(db) -> None:
+    """Create missing indexes and rebuild those whose definition changed."""
+    cursor = await db.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"
+    )
+    existing = {name: " ".join(sql.split()) for name, sql in await cursor.fetchall()}
+
+    for name in _DROPPED_INDEXES:
+        if name in existing:
+            await db.execute(f"DROP INDEX {name}")
+
+    for name, spec in _INDEXES.items():
+        ddl = f"CREATE INDEX {name} {spec}"
+        if existing.get(name) == ddl:
+            continue
+        if name in existing:
+            logger.info("Rebuilding index %s with new definition", name)
+            await db.execute(f"DROP INDEX {name}")
+        await db.execute(ddl)
+
+
+# STRICT tables (SQLite >= 3.37) reject mistyped values at write time and hand
+# stored values back without per-column affinity conversion. Only tables
+# created by this DDL get it; existing tables keep their original declaration.
+_STRICT = sqlite3.sqlite_version_info >= (3, 37, 0)
+
+_TABLES_DDL = """
+    CREATE TABLE IF NOT EXISTS transactions (
+        txn_id TEXT PRIMARY KEY,
+        timestamp TEXT NOT NULL,
+        amount REAL NOT NULL,
+        currency TEXT NOT NULL,
+        sender_id TEXT NOT NULL,
+        receiver_id TEXT NOT NULL,
+        txn_type TEXT NOT NULL,
+        channel TEXT,
+        ip_address TEXT,
+        device_id TEXT,
+        is_fraud_ground_truth INTEGER CHECK (is_fraud_ground_truth IN (0, 1)),
+        metadata TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        ts_epoch INTEGER
+    ){strict};
+
+    -- WITHOUT ROWID: rows live in the txn_id B-tree itself, so the
+    -- per-transaction lookup skips the hidden rowid hop.
+    CREATE TABLE IF NOT EXISTS risk_results (
+        txn_id TEXT PRIMARY KEY,
+        timestamp TEXT NOT NULL,
+        risk_score REAL NOT NULL,
+        flagged INTEGER NOT NULL CHECK (flagged IN (0, 1)),
+        threshold_used REAL,
+        model_version TEXT,
+        features TEXT,
+        matched_patterns TEXT
+    ) {strict_without_rowid};
+
+    CREATE TABLE IF NOT EXISTS cases (
+        case_id TEXT PRIMARY KEY,
+        txn_id TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'open',
+        created_at TEXT NOT NULL,
+        updated_at TEXT,
+        closed_at TEXT,
+        assigned_to TEXT,
+        priority TEXT DEFAULT 'medium',
+        risk_score REAL,
+        matched_patterns TEXT,
+        explanation TEXT
+    ){strict};
+
+    CREATE TABLE IF NOT EXISTS analyst_labels (
+        label_id TEXT PRIMARY KEY,
+        case_id TEXT NOT NULL,
+        txn_id TEXT,
+        decision TEXT NOT NULL,
+        confidence TEXT DEFAULT 'medium',
+        labeled_at TEXT NOT NULL,
+        labeled_by TEXT,
+        fraud_type TEXT,
+        notes TEXT
+    ){strict};
+
+    CREATE TABLE IF NOT EXISTS pattern_cards (
+        pattern_id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        description TEXT,
+        discovered_at TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'active',
+        pattern_type TEXT,
+        confidence REAL,
+        detection_rule TEXT,
+        stats TEXT,
+        related_txn_ids TEXT,
+        structural_sig TEXT
+    ){strict};
+
+    -- Pattern <-> transaction membership (normalized from
+    -- pattern_cards.related_txn_ids, which stays as a denormalized copy)
+    CREATE TABLE IF NOT EXISTS txn_pattern_matches (
+        pattern_id TEXT NOT NULL,
+        txn_id TEXT NOT NULL,
+        matched_at INTEGER,
+        PRIMARY KEY (pattern_id, txn_id)
+    ) {strict_without_rowid};
+
+    CREATE TRIGGER IF NOT EXISTS pattern_cards_matches_ad AFTER DELETE ON pattern_cards BEGIN
+        DELETE FROM txn_pattern_matches WHERE pattern_id = old.pattern_id;
+    END;
+
+    CREATE TABLE IF NOT EXISTS metric_snapshots (
+        snapshot_id TEXT PRIMARY KEY,
+        timestamp TEXT NOT NULL,
+        model_version TEXT,
+        metrics TEXT NOT NULL
+    ){strict};
+
+    -- Model state (threshold learning / version tracking)
+    CREATE TABLE IF NOT EXISTS model_state (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        threshold REAL NOT NULL DEFAULT 0.5,
+        model_version TEXT NOT NULL DEFAULT 'v1.0.0',
+        last_trained_at TEXT,
+        training_samples INTEGER DEFAULT 0,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+    ){strict};
+
+    INSERT OR IGNORE INTO model_state (id, threshold, model_version)
+        VALUES (1, 0.5, 'v1.0.0');
+
+    CREATE TABLE IF NOT EXISTS agent_decisions (
+        decision_id TEXT PRIMARY KEY,
+        timestamp TEXT NOT NULL,
+        decision_type TEXT NOT NULL,
+        reasoning TEXT,
+        context TEXT NOT NULL,
+        outcome TEXT,
+        model_version_before TEXT,
+        model_version_after TEXT,
+        source TEXT DEFAULT 'guardian'
+    ){strict};
+""".format(
+    strict=" STRICT" if _STRICT else "",
+    strict_without_rowid="STRICT, WITHOUT ROWID" if _STRICT else "WITHOUT ROWID",
+)
+
+
+# Write-only view for ingesting a scored transaction in one statement. Its
+# INSTEAD OF trigger fans a single INSERT out to transactions, risk_results
+# and (when case_id is set) cases, so the API pays one round-trip instead of
+# three. SQLite has no writable CTEs; this is its equivalent. Dropped and
+# recreated on every schema init so definition changes always apply.
+_INGEST_DDL = """
+    DROP TRIGGER IF EXISTS txn_ingest_insert;
+    DROP VIEW IF EXISTS txn_ingest;
+
+    CREATE VIEW txn_ingest AS SELECT
+        NULL AS txn_id, NULL AS timestamp, NULL AS amount, NULL AS currency,
+        NULL AS sender_id, NULL AS receiver_id, NULL AS txn_type, NULL AS channel,
+        NULL AS ip_address, NULL AS device_id, NULL AS is_fraud_ground_truth,
+        NULL AS metadata, NULL AS ts_epoch,
+        NULL AS scored_at, NULL AS risk_score, NULL AS flagged, NULL AS threshold_used,
+        NULL AS model_version, NULL AS features, NULL AS matched_patterns,
+        NULL AS case_id, NULL AS priority
+    WHERE 0;
+
+    CREATE TRIGGER txn_ingest_insert INSTEAD OF INSERT ON txn_ingest BEGIN
+        INSERT INTO transactions
+            (txn_id, timestamp, amount, currency, sender_id, receiver_id, txn_type, channel,
+             ip_address, device_id, is_fraud_ground_truth, metadata, ts_epoch)
+        VALUES
+            (NEW.txn_id, NEW.timestamp, NEW.amount, NEW.currency, NEW.sender_id, NEW.receiver_id,
+             NEW.txn_type, NEW.channel, NEW.ip_address, NEW.device_id, NEW.is_fraud_ground_truth,
+             NEW.metadata, NEW.ts_epoch);
+        INSERT INTO risk_results
+            (txn_id, timestamp, risk_score, flagged, threshold_used, model_version, features, matched_patterns)
+        VALUES
+            (NEW.txn_id, NEW.scored_at, NEW.risk_score, NEW.flagged, NEW.threshold_used,
+             NEW.model_version, NEW.features, NEW.matched_patterns);
+        INSERT INTO cases (case_id, txn_id, status, created_at, priority, risk_score)
+        SELECT NEW.case_id, NEW.txn_id, 'open', NEW.timestamp, NEW.priority, NEW.risk_score
+        WHERE NEW.case_id IS NOT NULL;
+    END;
+"""
+
+
+# Row counts behind /metrics, kept current by triggers so the endpoint reads
+# four rows instead of counting whole tables. cases_open covers 'open' and
+# 'in_review'. Triggers are recreated and the counts re-seeded from the
+# tables on every schema init, so they can't start out of step.
+# pattern_cards_version is bumped by every pattern_cards write; it tags the
+# in-process pattern index (patterns/features.py). It starts at a random
+# value so an index built against another database file can't match it.
+_COUNTERS_DDL = """
+    CREATE TABLE IF NOT EXISTS counters (
+        name TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    ) {strict_without_rowid};
+
+    DROP TRIGGER IF EXISTS counters_txn_ai;
+    DROP TRIGGER IF EXISTS counters_txn_ad;
+    DROP TRIGGER IF EXISTS counters_risk_ai;
+    DROP TRIGGER IF EXISTS counters_risk_ad;
+    DROP TRIGGER IF EXISTS counters_risk_au;
+    DROP TRIGGER IF EXISTS counters_cases_ai;
+    DROP TRIGGER IF EXISTS counters_cases_ad;
+    DROP TRIGGER IF EXISTS counters_cases_au;
+    DROP TRIGGER IF EXISTS counters_patterns_ai;
+    DROP TRIGGER IF EXISTS counters_patterns_ad;
+    DROP TRIGGER IF EXISTS counters_patterns_au;
+
+    CREATE TRIGGER counters_txn_ai AFTER INSERT ON transactions BEGIN
+        UPDATE counters SET value = value + 1 WHERE name = 'total_txns';
+    END;
+    CREATE TRIGGER counters_txn_ad AFTER DELETE ON transactions BEGIN
+        UPDATE counters SET value = value - 1 WHERE name = 'total_txns';
+    END;
+
+    CREATE TRIGGER counters_risk_ai AFTER INSERT ON risk_results WHEN new.flagged = 1 BEGIN
+        UPDATE counters SET value = value + 1 WHERE name = 'flagged_txns';
+    END;
+    CREATE TRIGGER counters_risk_ad AFTER DELETE ON risk_results WHEN old.flagged = 1 BEGIN
+        UPDATE counters SET value = value - 1 WHERE name = 'flagged_txns';
+    END;
+    CREATE TRIGGER counters_risk_au AFTER UPDATE OF flagged ON risk_results
+    WHEN new.flagged IS NOT old.flagged BEGIN
+        UPDATE counters SET value = value + new.flagged - old.flagged WHERE name = 'flagged_txns';
+    END;
+
+    CREATE TRIGGER counters_cases_ai AFTER INSERT ON cases BEGIN
+        UPDATE counters SET value = value + 1
+        WHERE name = CASE WHEN new.status IN ('open', 'in_review') THEN 'cases_open'
+                          WHEN new.status = 'closed' THEN 'cases_closed' END;
+    END;
+    CREATE TRIGGER counters_cases_ad AFTER DELETE ON cases BEGIN
+        UPDATE counters SET value = value - 1
+        WHERE name = CASE WHEN old.status IN ('open', 'in_review') THEN 'cases_open'
+                          WHEN old.status = 'closed' THEN 'cases_closed' END;
+    END;
+    CREATE TRIGGER counters_cases_au AFTER UPDATE OF status ON cases
+    WHEN new.status IS NOT old.status BEGIN
+        UPDATE counters SET value = value - 1
+        WHERE name = CASE WHEN old.status IN ('open', 'in_review') THEN 'cases_open'
+                          WHEN old.status = 'closed' THEN 'cases_closed' END;
+        UPDATE counters SET value = value + 1
+        WHERE name = CASE WHEN new.status IN ('open', 'in_review') THEN 'cases_open'
+                          WHEN new.status = 'closed' THEN 'cases_closed' END;
+    END;
+
+    CREATE TRIGGER counters_patterns_ai AFTER INSERT ON pattern_cards BEGIN
+        UPDATE counters SET value = value + 1 WHERE name = 'pattern_cards_version';
+    END;
+    CREATE TRIGGER counters_patterns_ad AFTER DELETE ON pattern_cards BEGIN
+        UPDATE counters SET value = value + 1 WHERE name = 'pattern_cards_version';
+    END;
+    CREATE TRIGGER counters_patterns_au AFTER UPDATE ON pattern_cards BEGIN
+        UPDATE counters SET value = value + 1 WHERE name = 'pattern_cards_version';
+    END;
+
+    INSERT OR IGNORE INTO counters (name, value)
+        VALUES ('pattern_cards_version', abs(random() % 1000000000000));
+
+    INSERT OR REPLACE INTO counters (name, value)
+        SELECT 'total_txns', COUNT(*) FROM transactions
+        UNION ALL SELECT 'flagged_txns', COUNT(*) FROM risk_results WHERE flagged = 1
+        UNION ALL SELECT 'cases_open', COUNT(*) FROM cases WHERE status IN ('open', 'in_review')
+        UNION ALL SELECT 'cases_closed', COUNT(*) FROM cases WHERE status = 'closed';
+""".format(
+    strict_without_rowid="STRICT, WITHOUT ROWID" if _STRICT else "WITHOUT ROWID",
+)
+
+
+# Full-text index over pattern cards (external content: the text lives only in
+# pattern_cards, the FTS table holds just the token index). Triggers keep it
+# in sync. '_' and '-' are token characters so entity IDs stay whole tokens.
+_PATTERN_FTS_DDL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS pattern_cards_fts USING fts5(
+        name, description, detection_rule,
+        content='pattern_cards', content_rowid='rowid',
+        tokenize="unicode61 tokenchars '_-'"
+    );
+
+    CREATE TRIGGER IF NOT EXISTS pattern_cards_fts_ai AFTER INSERT ON pattern_cards BEGIN
+        INSERT INTO pattern_cards_fts(rowid, name, description, detection_rule)
+        VALUES (new.rowid, new.name, new.description, new.detection_rule);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS pattern_cards_fts_ad AFTER DELETE ON pattern_cards BEGIN
+        INSERT INTO pattern_cards_fts(pattern_cards_fts, rowid, name, description, detection_rule)
+        VALUES ('delete', old.rowid, old.name, old.description, old.detection_rule);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS pattern_cards_fts_au
+    AFTER UPDATE OF name, description, detection_rule ON pattern_cards BEGIN
+        INSERT INTO pattern_cards_fts(pattern_cards_fts, rowid, name, description, detection_rule)
+        VALUES ('delete', old.rowid, old.name, old.description, old.detection_rule);
+        INSERT INTO pattern_cards_fts(rowid, name, description, detection_rule)
+        VALUES (new.rowid, new.name, new.description, new.detection_rule);
+    END;
+"""
+
+
+def fts_query(text: str) -> str:
+    """Turn free text into an FTS5 MATCH expression of quoted terms (implicit AND).
+
+    Quoting keeps user input from being parsed as FTS5 query syntax.
+    """
+    return " ".join('"' + term.replace('"', '""') + '"' for term in text.split())
+
+
+async def _ensure_pattern_fts(db) -> None:
+    """Create the pattern_cards full-text index, backfilling it on first creation."""
+    cursor = await db.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'pattern_cards_fts'"
+    )
+    existed = await cursor.fetchone() is not None
     try:
-        yield db
-    finally:
-        await db.close()
+        await db.executescript(_PATTERN_FTS_DDL)
+    except Exception as e:
+        logger.warning("FTS5 unavailable, pattern search falls back to LIKE: %s", e)
+        return
+    if not existed:
+        await db.execute("INSERT INTO pattern_cards_fts(pattern_cards_fts) VALUES ('rebuild')")
 
 
 async def init_db_tables():
-    """Ensure tables exist (idempotent)."""
+    """Ensure tables exist (idempotent).
+
+    Skipped entirely when the database already reports CURRENT_SCHEMA_VERSION.
+    """
     async with get_db() as db:
-        await db.executescript("""
-            CREATE TABLE IF NOT EXISTS transactions (
-                txn_id TEXT PRIMARY KEY,
-                timestamp TEXT NOT NULL,
-                amount REAL NOT NULL,
-                currency TEXT NOT NULL,
-                sender_id TEXT NOT NULL,
-                receiver_id TEXT NOT NULL,
-                txn_type TEXT NOT NULL,
-                channel TEXT,
-                ip_address TEXT,
-                device_id TEXT,
-                is_fraud_ground_truth INTEGER,
-                metadata TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            );
-
-            CREATE TABLE IF NOT EXISTS risk_results (
-                txn_id TEXT PRIMARY KEY,
-                timestamp TEXT NOT NULL,
-                risk_score REAL NOT NULL,
-                flagged INTEGER NOT NULL,
-                threshold_used REAL,
-                model_version TEXT,
-                features TEXT,
-                matched_patterns TEXT
-            );
-
-            CREATE TABLE IF NOT EXISTS cases (
-                case_id TEXT PRIMARY KEY,
-                txn_id TEXT NOT NULL,
-                status TEXT NOT NULL DEFAULT 'open',
-                created_at TEXT NOT NULL,
-                updated_at TEXT,
-                closed_at TEXT,
-                assigned_to TEXT,
-                priority TEXT DEFAULT 'medium',
-                risk_score REAL,
-                matched_patterns TEXT,
-                explanation TEXT
-            );
-
-            CREATE TABLE IF NOT EXISTS analyst_labels (
-                label_id TEXT PRIMARY KEY,
-                case_id TEXT NOT NULL,
-                txn_id TEXT,
-                decision TEXT NOT NULL,
-                confidence TEXT DEFAULT 'medium',
-                labeled_at TEXT NOT NULL,
-                labeled_by TEXT,
-                fraud_type TEXT,
-                notes TEXT
-            );
-
-            CREATE TABLE IF NOT EXISTS pattern_cards (
-                pattern_id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                description TEXT,
-                discovered_at TEXT NOT NULL,
-                status TEXT NOT NULL DEFAULT 'active',
-                pattern_type TEXT,
-                confidence REAL,
-                detection_rule TEXT,
-                stats TEXT,
-                related_txn_ids TEXT
-            );
-
-            CREATE TABLE IF NOT EXISTS metric_snapshots (
-                snapshot_id TEXT PRIMARY KEY,
-                timestamp TEXT NOT NULL,
-                model_version TEXT,
-                metrics TEXT NOT NULL
-            );
-
-            -- Model state (threshold learning / version tracking)
-            CREATE TABLE IF NOT EXISTS model_state (
-                id INTEGER PRIMARY KEY CHECK (id = 1),
-                threshold REAL NOT NULL DEFAULT 0.5,
-                model_version TEXT NOT NULL DEFAULT 'v1.0.0',
-                last_trained_at TEXT,
-                training_samples INTEGER DEFAULT 0,
-                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-            );
-
-            INSERT OR IGNORE INTO model_state (id, threshold, model_version)
-                VALUES (1, 0.5, 'v1.0.0');
-
-            CREATE TABLE IF NOT EXISTS agent_decisions (
-                decision_id TEXT PRIMARY KEY,
-                timestamp TEXT NOT NULL,
-                decision_type TEXT NOT NULL,
-                reasoning TEXT,
-                context TEXT NOT NULL,
-                outcome TEXT,
-                model_version_before TEXT,
-                model_version_after TEXT,
-                source TEXT DEFAULT 'guardian'
-            );
-
-            -- Indexes for velocity queries (critical for scoring performance)
-            CREATE INDEX IF NOT EXISTS idx_agent_decisions_ts
-                ON agent_decisions(timestamp);
-            CREATE INDEX IF NOT EXISTS idx_txn_sender_ts
-                ON transactions(sender_id, timestamp);
-            CREATE INDEX IF NOT EXISTS idx_txn_receiver
-                ON transactions(receiver_id);
-            CREATE INDEX IF NOT EXISTS idx_cases_status
-                ON cases(status);
-            CREATE INDEX IF NOT EXISTS idx_risk_results_flagged
-                ON risk_results(flagged);
-
-            -- Compound indexes for consolidated velocity queries
-            CREATE INDEX IF NOT EXISTS idx_txn_receiver_ts
-                ON transactions(receiver_id, timestamp);
-            CREATE INDEX IF NOT EXISTS idx_txn_sender_receiver
-                ON transactions(sender_id, receiver_id);
-            CREATE INDEX IF NOT EXISTS idx_txn_device_ts
-                ON transactions(device_id, timestamp);
-            CREATE INDEX IF NOT EXISTS idx_txn_ip_ts
-                ON transactions(ip_address, timestamp);
-        """)
+        cursor = await db.execute("PRAGMA user_version")
+        version = (await cursor.fetchone())[0]
+        if version == CURRENT_SCHEMA_VERSION:
+            return
+
+        # page_size can only change before the first table is created (and never
+        # once in WAL mode); 16 KiB pages keep the B-trees a level shallower.
+        cursor = await db.execute("PRAGMA page_count")
+        if (await cursor.fetchone())[0] == 0:
+            await db.execute(f"PRAGMA page_size={PAGE_SIZE}")
+
+        # WAL gives better concurrent read/write performance. It is a
+        # database-level setting, so set it once here rather than per connection.
+        cursor = await db.execute("PRAGMA journal_mode=WAL")
+        journal_mode = (await cursor.fetchone())[0]
+        if journal_mode != "wal" and not MEMORY_URI:
+            logger.warning("SQLite journal_mode is %r, expected 'wal'", journal_mode)
+
+        await db.executescript(_TABLES_DDL)
 
         # Schema migration: add explanation column to existing databases
         try:
@@ -155,4 +587,62 @@ async def init_db_tables():
         except Exception:
             pass  # Column already exists
 
+        # Schema migration: integer unix-seconds copy of transactions.timestamp.
+        # The ISO text column stays the API contract; ts_epoch lets time-window
+        # range scans compare 8-byte integers instead of collating strings.
+        try:
+            await db.execute(
+                "ALTER TABLE transactions ADD COLUMN ts_epoch INTEGER"
+            )
+        except Exception:
+            pass  # Column already exists
+        await db.execute(
+            "UPDATE transactions SET ts_epoch = CAST(strftime('%s', timestamp) AS INTEGER) "
+            "WHERE ts_epoch IS NULL"
+        )
+
+        # Schema migration: stored dedup signature for pattern cards. Existing
+        # rows keep NULL; the mining job fills them in the first time it runs.
+        try:
+            await db.execute(
+                "ALTER TABLE pattern_cards ADD COLUMN structural_sig TEXT"
+            )
+        except Exception:
+            pass  # Column already exists
+        if version < 14:
+            # v14 changed the signature hash; the mining job recomputes NULLs
+            await db.execute("UPDATE pattern_cards SET structural_sig = NULL")
+
+        # Data migration: fill txn_pattern_matches from the JSON copies
+        try:
+            await db.execute(
+                """INSERT OR IGNORE INTO txn_pattern_matches (pattern_id, txn_id, matched_at)
+                   SELECT p.pattern_id, j.value, CAST(strftime('%s', p.discovered_at) AS INTEGER)
+                   FROM pattern_cards p, json_each(p.related_txn_ids) j
+                   WHERE p.related_txn_ids IS NOT NULL"""
+            )
+        except Exception:
+            logger.warning("json1 unavailable, txn_pattern_matches not backfilled")
+
+        await _sync_indexes(db)
+        await _ensure_pattern_fts(db)
+        await db.executescript(_INGEST_DDL)
+        await db.executescript(_COUNTERS_DDL)
+        # Persist planner statistics (sqlite_stat1) so index choice among the
+        # overlapping transactions indexes doesn't fall back to heuristics.
+        # analysis_limit bounds the per-index sampling on large databases.
+        await db.execute("PRAGMA analysis_limit=1000")
+        await db.execute("ANALYZE")
+        await db.execute(f"PRAGMA user_version = {CURRENT_SCHEMA_VERSION}")
         await db.commit()
+
+
+async def optimize_db():
+    """Re-analyze tables whose planner statistics have gone stale.
+
+    PRAGMA optimize only does work when row counts have drifted, so this is
+    cheap to call periodically on long-lived (pooled) connections.
+    """
+    async with get_db() as db:
+        await db.execute("PRAGMA analysis_limit=400")
+        await db.execute("PRAGMA optimize")
@@ -3,30 +3,43 @@ import asyncio
 import json
 import logging
 import math
+import sqlite3
 import time as _time_mod
 import traceback
 from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, Literal
 from uuid import uuid4
 
 import httpx
 import numpy as np
+import orjson
 from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
-from pydantic import BaseModel, Field, field_validator
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from backend.db import get_db, init_db_tables
+from backend.db import (
+    SNAPSHOT_INSERT_SQL,
+    close_db,
+    fetch_one,
+    fts_query,
+    get_db,
+    init_db_tables,
+    open_pool,
+    optimize_db,
+    to_json,
+)
 from config import get_settings
-from patterns.features import compute_pattern_features
+from patterns.features import get_pattern_index, pattern_features_from_index
 from patterns.miner import run_mining_job_async
-from risk.explainer import _build_llm_prompt, _call_ollama_stream, explain_case
+from risk.batcher import close_score_batcher, get_score_batcher
+from risk.explainer import _build_llm_prompt, _call_ollama_stream, close_http_client, explain_case
 from risk.guardian import _retrain_lock, run_guardian_loop
-from risk.scorer import THRESHOLDS, reload_model, score_transaction
+from risk.scorer import THRESHOLDS, reload_model
 from risk.trainer import (
     FEATURE_NAMES,
     MIN_SAMPLES_PER_CLASS,
@@ -45,6 +58,26 @@ logging.basicConfig(
 logger = logging.getLogger("fraud-agent")
 
 
+# Date/time prefix of the current second, reused until the second rolls over
+_ts_sec = -1
+_ts_prefix = ""
+
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO string, in the naive format stored in the DB.
+
+    Only the millisecond suffix is formatted per call; the datetime part is
+    built once per second.
+    """
+    global _ts_sec, _ts_prefix
+    now = _time_mod.time()
+    sec = int(now)
+    if sec != _ts_sec:
+        _ts_prefix = datetime.fromtimestamp(sec, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        _ts_sec = sec
+    return f"{_ts_prefix}.{int((now - sec) * 1000):03d}"
+
+
 # --- Pydantic Models (matching schemas) ---
 class TransactionIn(BaseModel):
     amount: float = Field(ge=0, le=1_000_000_000)
@@ -62,7 +95,7 @@ class TransactionIn(BaseModel):
     @classmethod
     def reject_special_floats(cls, v: Any) -> float:
         """Reject NaN, Infinity, and -Infinity before Pydantic coercion."""
-        if isinstance(v, float) and (math.isnan(v) or math.isinf(v)):
+        if isinstance(v, float) and not math.isfinite(v):
             raise ValueError("amount must be a finite number (not NaN or Infinity)")
         if isinstance(v, bool):
             raise ValueError("amount must be a number, not a boolean")
@@ -91,6 +124,20 @@ class CaseOut(BaseModel):
     risk_score: float | None
 
 
+# List endpoints validate and serialize whole result sets in one pydantic-core
+# call instead of building a model per row and having FastAPI re-validate it.
+_TXN_FIELDS = tuple(TransactionOut.model_fields)
+_CASE_FIELDS = tuple(CaseOut.model_fields)
+_TXN_LIST_ADAPTER = TypeAdapter(list[TransactionOut])
+_CASE_LIST_ADAPTER = TypeAdapter(list[CaseOut])
+
+
+def _json_list_response(adapter: TypeAdapter, fields: tuple[str, ...], rows) -> Response:
+    """Serialize DB rows (columns in `fields` order) through a list TypeAdapter."""
+    items = adapter.validate_python([dict(zip(fields, r)) for r in rows])
+    return Response(content=adapter.dump_json(items), media_type="application/json")
+
+
 class LabelIn(BaseModel):
     decision: Literal["fraud", "not_fraud", "needs_info"]
     confidence: str = "medium"  # low, medium, high
@@ -113,14 +160,45 @@ class MetricsOut(BaseModel):
 # --- Guardian globals ---
 _guardian_task: asyncio.Task | None = None
 _mining_task: asyncio.Task | None = None
+_optimize_task: asyncio.Task | None = None
 
 # Dedicated LLM thread pool — isolates Ollama calls from the main executor
 # so LLM hangs can never starve DB queries, metrics, or health checks.
 _llm_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="llm")
 
+# Bounds concurrent auto-explain tasks so a burst of flagged transactions
+# can't pile onto the LLM pool and the DB pool at once.
+_explain_semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_EXPLAIN)
+
+# Fire-and-forget tasks (auto-explain, auto-retrain). Holding a reference
+# keeps them from being garbage-collected mid-run and lets shutdown drain them.
+_bg_tasks: set[asyncio.Task] = set()
+
+
+def _spawn_background(coro) -> asyncio.Task:
+    """Start a background task tracked in _bg_tasks until it finishes."""
+    task = asyncio.create_task(coro)
+    _bg_tasks.add(task)
+    task.add_done_callback(_bg_tasks.discard)
+    return task
+
+
 # --- Auto-retrain debounce ---
 _last_retrain_time: float = 0
 
+# Decision thresholds bound as module floats for the per-request read paths.
+# THRESHOLDS may be updated by the learning loop, so _reload_model refreshes them.
+_REVIEW_THRESHOLD: float = float(THRESHOLDS["review"])
+_BLOCK_THRESHOLD: float = float(THRESHOLDS["block"])
+
+
+def _reload_model():
+    """Reload the scorer's model and re-read the decision thresholds."""
+    global _REVIEW_THRESHOLD, _BLOCK_THRESHOLD
+    reload_model()
+    _REVIEW_THRESHOLD = float(THRESHOLDS["review"])
+    _BLOCK_THRESHOLD = float(THRESHOLDS["block"])
+
 
 # --- Periodic pattern mining ---
 async def _periodic_mining(interval: int = 90):
@@ -130,14 +208,7 @@ async def _periodic_mining(interval: int = 90):
         try:
             async with get_db() as db:
                 patterns = await run_mining_job_async(db)
-            for p in patterns:
-                _publish_event({
-                    "type": "pattern",
-                    "name": p.name,
-                    "pattern_type": p.pattern_type,
-                    "confidence": p.confidence,
-                    "timestamp": datetime.utcnow().isoformat(),
-                })
+            _publish_patterns(patterns)
             if patterns:
                 logger.info("Periodic mining found %d patterns", len(patterns))
         except Exception:
@@ -145,6 +216,48 @@ async def _periodic_mining(interval: int = 90):
         await asyncio.sleep(interval)
 
 
+# --- Periodic planner statistics refresh ---
+async def _periodic_optimize(interval: int = 3600):
+    """Run PRAGMA optimize every `interval` seconds as ingest changes table sizes."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await optimize_db()
+        except Exception:
+            logger.exception("Periodic PRAGMA optimize error")
+
+
+# --- Related patterns for explanations ---
+async def _fetch_related_patterns(db, sender_id: str, receiver_id: str, limit: int = 20) -> list[dict]:
+    """Active pattern cards whose description mentions the sender or receiver.
+
+    Matched through the pattern_cards_fts index (whole entity ids, so
+    user_1 doesn't match user_12), with a LIKE scan when FTS5 is missing.
+    """
+    ids = [entity_id for entity_id in (sender_id, receiver_id) if entity_id]
+    if not ids:
+        return []
+    try:
+        cursor = await db.execute(
+            """SELECT p.name, p.pattern_type, p.confidence, p.description
+               FROM pattern_cards_fts f JOIN pattern_cards p ON p.rowid = f.rowid
+               WHERE pattern_cards_fts MATCH ? AND p.status = 'active' LIMIT ?""",
+            (" OR ".join(f"description : ({fts_query(entity_id)})" for entity_id in ids), limit),
+        )
+    except sqlite3.OperationalError:
+        # FTS5 not available in this SQLite build
+        cursor = await db.execute(
+            """SELECT name, pattern_type, confidence, description FROM pattern_cards
+               WHERE status = 'active' AND (description LIKE ?1 OR description LIKE ?2)
+               LIMIT ?3""",
+            (f"%{ids[0]}%", f"%{ids[-1]}%", limit),
+        )
+    return [
+        {"name": r[0], "pattern_type": r[1], "confidence": r[2], "description": r[3]}
+        for r in await cursor.fetchall()
+    ]
+
+
 # --- Auto-explain background task ---
 async def _auto_explain_case(
     case_id: str,
@@ -159,133 +272,127 @@ async def _auto_explain_case(
     """Generate explanation in background and store it with the case.
 
     Runs as an asyncio task immediately after case creation so the
-    explanation is ready before the analyst opens the case.
+    explanation is ready before the analyst opens the case. At most
+    MAX_CONCURRENT_EXPLAIN run at once; the rest wait on the semaphore.
     """
-    try:
-        # Fetch related patterns
-        related_patterns = []
-        async with get_db() as db:
-            cursor = await db.execute(
-                "SELECT name, pattern_type, confidence, description "
-                "FROM pattern_cards WHERE status = 'active' LIMIT 20"
-            )
-            all_patterns = [
-                {"name": r[0], "pattern_type": r[1], "confidence": r[2], "description": r[3]}
-                for r in await cursor.fetchall()
-            ]
-            sender = txn_data.get("sender_id", "")
-            receiver = txn_data.get("receiver_id", "")
-            related_patterns = [
-                p for p in all_patterns
-                if sender in (p.get("description") or "")
-                or receiver in (p.get("description") or "")
-            ]
-
-        # Generate explanation in dedicated LLM thread pool with hard timeout.
-        # This prevents Ollama hangs from starving the main thread pool (cascade fix).
-        loop = asyncio.get_running_loop()
-        explanation = await asyncio.wait_for(
-            loop.run_in_executor(
-                _llm_executor,
-                lambda: explain_case(
-                    txn=txn_data,
-                    risk_score=risk_score,
-                    decision=decision,
-                    features=features,
-                    reasons=reasons,
-                    patterns=related_patterns,
-                    model_version=model_version,
-                ),
-            ),
-            timeout=15.0,
-        )
+    async with _explain_semaphore:
+        try:
+            # Fetch related patterns
+            async with get_db() as db:
+                related_patterns = await _fetch_related_patterns(
+                    db, txn_data.get("sender_id", ""), txn_data.get("receiver_id", ""),
+                )
 
-        # Store explanation in DB
-        explanation_json = json.dumps(explanation)
-        async with get_db() as db:
-            await db.execute(
-                "UPDATE cases SET explanation = ? WHERE case_id = ?",
-                (explanation_json, case_id),
+            # Generate explanation in dedicated LLM thread pool with hard timeout.
+            # This prevents Ollama hangs from starving the main thread pool (cascade fix).
+            loop = asyncio.get_running_loop()
+            explanation = await asyncio.wait_for(
+                loop.run_in_executor(
+                    _llm_executor,
+                    lambda: explain_case(
+                        txn=txn_data,
+                        risk_score=risk_score,
+                        decision=decision,
+                        features=features,
+                        reasons=reasons,
+                        patterns=related_patterns,
+                        model_version=model_version,
+                    ),
+                ),
+                timeout=15.0,
             )
-            await db.commit()
 
-        # Publish SSE event so UI can show the explanation immediately
-        _publish_event({
-            "type": "case_explained",
-            "case_id": case_id,
-            "txn_id": txn_id,
-            "agent": explanation.get("agent", "unknown"),
-            "summary": explanation.get("summary", "")[:200],
-            "recommendation": explanation.get("recommendation", "")[:200],
-            "timestamp": datetime.utcnow().isoformat(),
-        })
-
-        logger.info(
-            "Auto-explained case %s via %s",
-            case_id[:8], explanation.get("agent", "?"),
-        )
-    except asyncio.TimeoutError:
-        # Ollama hung — store template fallback so case isn't left with NULL explanation
-        logger.warning("Auto-explain timed out for case %s — storing template fallback", case_id[:8])
-        fallback = {
-            "summary": f"Risk score {risk_score:.3f} ({decision.upper()}). Analysis pending — template summary.",
-            "risk_factors": reasons if reasons else ["See risk score and features."],
-            "behavioral_analysis": "", "pattern_context": "",
-            "recommendation": f"{decision.upper()} based on risk score {risk_score:.3f}.",
-            "confidence_note": "", "full_explanation": "",
-            "agent": "fraud-agent-v1 (timeout-fallback)",
-            "investigation_timeline": [],
-        }
-        try:
+            # Store explanation in DB
+            explanation_json = to_json(explanation)
             async with get_db() as db:
                 await db.execute(
                     "UPDATE cases SET explanation = ? WHERE case_id = ?",
-                    (json.dumps(fallback), case_id),
+                    (explanation_json, case_id),
                 )
                 await db.commit()
+
+            # Publish SSE event so UI can show the explanation immediately
+            _publish_event({
+                "type": "case_explained",
+                "case_id": case_id,
+                "txn_id": txn_id,
+                "agent": explanation.get("agent", "unknown"),
+                "summary": explanation.get("summary", "")[:200],
+                "recommendation": explanation.get("recommendation", "")[:200],
+                "timestamp": _now_iso(),
+            })
+
+            logger.info(
+                "Auto-explained case %s via %s",
+                case_id[:8], explanation.get("agent", "?"),
+            )
+        except asyncio.TimeoutError:
+            # Ollama hung — store template fallback so case isn't left with NULL explanation
+            logger.warning("Auto-explain timed out for case %s — storing template fallback", case_id[:8])
+            fallback = {
+                "summary": f"Risk score {risk_score:.3f} ({decision.upper()}). Analysis pending — template summary.",
+                "risk_factors": reasons if reasons else ["See risk score and features."],
+                "behavioral_analysis": "", "pattern_context": "",
+                "recommendation": f"{decision.upper()} based on risk score {risk_score:.3f}.",
+                "confidence_note": "", "full_explanation": "",
+                "agent": "fraud-agent-v1 (timeout-fallback)",
+                "investigation_timeline": [],
+            }
+            try:
+                async with get_db() as db:
+                    await db.execute(
+                        "UPDATE cases SET explanation = ? WHERE case_id = ?",
+                        (to_json(fallback), case_id),
+                    )
+                    await db.commit()
+            except Exception:
+                pass
         except Exception:
-            pass
-    except Exception:
-        logger.exception("Auto-explain failed for case %s", case_id[:8])
+            logger.exception("Auto-explain failed for case %s", case_id[:8])
 
 
 # --- Lifespan ---
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    app.state.db_pool = await open_pool()
     await init_db_tables()
 
     # Seed initial metric snapshot from bootstrap model if none exist
     try:
         async with get_db() as db:
-            cursor = await db.execute("SELECT COUNT(*) FROM metric_snapshots")
-            count = (await cursor.fetchone())[0]
+            count = (await fetch_one(db, "SELECT COUNT(*) FROM metric_snapshots"))[0]
             if count == 0:
                 # Check if a bootstrap model metrics file exists
                 from pathlib import Path
-                models_dir = Path(get_settings().MODELS_DIR)
+                models_dir = Path(settings.MODELS_DIR)
                 metrics_files = sorted(models_dir.glob("metrics_v*.json"))
                 if metrics_files:
                     latest_metrics_file = metrics_files[-1]
-                    metrics_data = json.loads(latest_metrics_file.read_text())
+                    metrics_data = orjson.loads(latest_metrics_file.read_bytes())
                     version = get_model_version()
                     await db.execute(
-                        """INSERT INTO metric_snapshots (snapshot_id, timestamp, model_version, metrics)
-                           VALUES (?, ?, ?, ?)""",
-                        (str(uuid4()), datetime.utcnow().isoformat(), version,
-                         json.dumps(metrics_data)),
+                        SNAPSHOT_INSERT_SQL,
+                        (str(uuid4()), _now_iso(), version,
+                         to_json(metrics_data)),
                     )
                     await db.commit()
                     logger.info("Seeded initial metric snapshot from bootstrap model (%s)", version)
     except Exception:
         logger.debug("Could not seed initial metric snapshot (non-critical)")
 
-    global _guardian_task, _mining_task
-    if get_settings().GUARDIAN_ENABLED:
+    global _guardian_task, _mining_task, _optimize_task
+    if settings.GUARDIAN_ENABLED:
         _guardian_task = asyncio.create_task(
             run_guardian_loop(_publish_event, _do_retrain)
         )
     _mining_task = asyncio.create_task(_periodic_mining())
+    _optimize_task = asyncio.create_task(_periodic_optimize())
     yield
+    _optimize_task.cancel()
+    try:
+        await asyncio.wait_for(_optimize_task, timeout=5.0)
+    except (asyncio.CancelledError, asyncio.TimeoutError):
+        pass
     if _mining_task:
         _mining_task.cancel()
         try:
@@ -298,6 +405,18 @@ async def lifespan(app: FastAPI):
             await asyncio.wait_for(_guardian_task, timeout=5.0)
         except (asyncio.CancelledError, asyncio.TimeoutError):
             pass
+    if _heartbeat_task:
+        _heartbeat_task.cancel()
+    if _bg_tasks:
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*_bg_tasks, return_exceptions=True), timeout=20.0,
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Background tasks still running at shutdown were cancelled")
+    await close_score_batcher()
+    close_http_client()
+    await close_db()
 
 
 # --- App ---
@@ -306,6 +425,7 @@ app = FastAPI(
     description="Backend for autonomous fraud detection demo",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # --- CORS Middleware ---
@@ -334,9 +454,9 @@ async def global_exception_handler(request: Request, exc: Exception):
 # --- Request Logging Middleware ---
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    start = datetime.utcnow()
+    start = _time_mod.perf_counter()
     response = await call_next(request)
-    elapsed = (datetime.utcnow() - start).total_seconds() * 1000
+    elapsed = (_time_mod.perf_counter() - start) * 1000.0
     logger.info(
         f"{request.method} {request.url.path} -> {response.status_code} ({elapsed:.0f}ms)"
     )
@@ -347,7 +467,7 @@ async def log_requests(request: Request, call_next):
 @app.get("/health")
 async def health():
     """Basic health check."""
-    return {"status": "ok", "timestamp": datetime.utcnow().isoformat()}
+    return {"status": "ok", "timestamp": _now_iso()}
 
 
 @app.get("/ready")
@@ -356,8 +476,7 @@ async def readiness():
     checks = {"db": False, "model": False}
     try:
         async with get_db() as db:
-            cursor = await db.execute("SELECT 1")
-            await cursor.fetchone()
+            await fetch_one(db, "SELECT 1")
             checks["db"] = True
     except Exception as e:
         logger.warning(f"DB readiness check failed: {e}")
@@ -367,118 +486,76 @@ async def readiness():
 
     return {
         "status": "ready" if all_ready else "degraded",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _now_iso(),
         "checks": checks,
         "model_version": get_model_version(),
     }
 
 
 # --- Velocity Feature Helpers ---
-async def _compute_velocity_features(db, sender_id: str, receiver_id: str,
-                                     device_id: str | None = None, ip_address: str | None = None) -> dict:
-    """Query DB for recent activity to compute velocity + abuse features.
-
-    Consolidated from 11 serial queries down to 3-4 queries using
-    conditional aggregation (CASE WHEN inside aggregate functions).
+async def _compute_all_features(db, sender_id: str, receiver_id: str,
+                                device_id: str | None = None, ip_address: str | None = None,
+                                now_epoch: int | None = None) -> dict:
+    """Query DB for velocity, abuse and pattern features in one statement.
+
+    The velocity side is a cross join of aggregate derived tables (each is
+    exactly one row), so the lookup costs one round-trip through the
+    aiosqlite thread. The same row carries the pattern_cards version, so
+    the cached pattern index is only reloaded after a pattern card changes.
     """
-    now = datetime.utcnow().isoformat()
-
-    # Query 1 — Sender stats (replaces 5 separate queries)
-    cursor = await db.execute(
-        """SELECT
-               COUNT(CASE WHEN timestamp >= datetime(?, '-1 hour') THEN 1 END),
-               COUNT(CASE WHEN timestamp >= datetime(?, '-24 hours') THEN 1 END),
-               COALESCE(SUM(CASE WHEN timestamp >= datetime(?, '-1 hour') THEN amount END), 0),
-               MAX(timestamp)
-           FROM transactions WHERE sender_id = ?""",
-        (now, now, now, sender_id),
-    )
-    sender_row = await cursor.fetchone()
-    txn_count_1h = sender_row[0]
-    txn_count_24h = sender_row[1]
-    amount_sum_1h = sender_row[2]
-    last_ts = sender_row[3]
-
-    # Unique receivers needs a separate query (COUNT(DISTINCT CASE WHEN ...) is
-    # unreliable in SQLite — it counts non-NULL results of the CASE, not distinct values)
-    cursor = await db.execute(
-        """SELECT COUNT(DISTINCT receiver_id) FROM transactions
-           WHERE sender_id = ? AND timestamp >= datetime(?, '-24 hours')""",
-        (sender_id, now),
-    )
-    unique_receivers_24h = (await cursor.fetchone())[0]
-
-    # Query 2 — Receiver stats (replaces 3 separate queries)
-    cursor = await db.execute(
-        """SELECT
-               COUNT(CASE WHEN timestamp >= datetime(?, '-24 hours') THEN 1 END),
-               COALESCE(SUM(CASE WHEN timestamp >= datetime(?, '-24 hours') THEN amount END), 0)
-           FROM transactions WHERE receiver_id = ?""",
-        (now, now, receiver_id),
+    # Window bounds are computed once here and compared against the integer
+    # ts_epoch column, so each index range scan is a plain integer compare.
+    now = int(_time_mod.time()) if now_epoch is None else now_epoch
+    bounds = {"since_1h": now - 3600, "since_24h": now - 86400, "since_90d": now - 90 * 86400}
+
+    # Unique receivers/senders are separate aggregates because
+    # COUNT(DISTINCT CASE WHEN ...) is unreliable in SQLite — it counts
+    # non-NULL results of the CASE, not distinct values.
+    # device_id / ip_address = NULL matches nothing, so absent values yield 0.
+    row = await fetch_one(
+        db,
+        """SELECT s.count_1h, s.count_24h, s.amount_1h, s.last_epoch,
+                  ur.n, r.count_24h, r.amount_24h, us.n, pair.n, dev.n, ip.n,
+                  (SELECT value FROM counters WHERE name = 'pattern_cards_version')
+           FROM
+               (SELECT
+                    COUNT(CASE WHEN ts_epoch >= :since_1h THEN 1 END) AS count_1h,
+                    COUNT(*) AS count_24h,
+                    COALESCE(SUM(CASE WHEN ts_epoch >= :since_1h THEN amount END), 0) AS amount_1h,
+                    (SELECT MAX(ts_epoch) FROM transactions WHERE sender_id = :sender) AS last_epoch
+                FROM transactions WHERE sender_id = :sender AND ts_epoch >= :since_24h) AS s,
+               (SELECT COUNT(DISTINCT receiver_id) AS n FROM transactions
+                WHERE sender_id = :sender AND ts_epoch >= :since_24h) AS ur,
+               (SELECT COUNT(*) AS count_24h, COALESCE(SUM(amount), 0) AS amount_24h
+                FROM transactions WHERE receiver_id = :receiver AND ts_epoch >= :since_24h) AS r,
+               (SELECT COUNT(DISTINCT sender_id) AS n FROM transactions
+                WHERE receiver_id = :receiver AND ts_epoch >= :since_24h) AS us,
+               (SELECT COUNT(*) AS n FROM transactions
+                WHERE sender_id = :sender AND receiver_id = :receiver
+                AND ts_epoch >= :since_90d) AS pair,
+               (SELECT COUNT(DISTINCT sender_id) AS n FROM transactions
+                WHERE device_id = :device AND ts_epoch >= :since_24h
+                AND sender_id != :sender) AS dev,
+               (SELECT COUNT(DISTINCT sender_id) AS n FROM transactions
+                WHERE ip_address = :ip AND ts_epoch >= :since_24h
+                AND sender_id != :sender) AS ip""",
+        {**bounds, "sender": sender_id, "receiver": receiver_id,
+         "device": device_id, "ip": ip_address},
     )
-    receiver_row = await cursor.fetchone()
-    receiver_txn_count_24h = receiver_row[0]
-    receiver_amount_sum_24h = receiver_row[1]
-
-    # Unique senders to receiver also needs a separate query for same reason
-    cursor = await db.execute(
-        """SELECT COUNT(DISTINCT sender_id) FROM transactions
-           WHERE receiver_id = ? AND timestamp >= datetime(?, '-24 hours')""",
-        (receiver_id, now),
-    )
-    receiver_unique_senders_24h = (await cursor.fetchone())[0]
-
-    # Query 3 — First-time counterparty (with 90-day bound)
-    cursor = await db.execute(
-        """SELECT COUNT(*) FROM transactions
-           WHERE sender_id = ? AND receiver_id = ?
-           AND timestamp >= datetime(?, '-90 days')""",
-        (sender_id, receiver_id, now),
-    )
-    prior_pair_count = (await cursor.fetchone())[0]
+    (txn_count_1h, txn_count_24h, amount_sum_1h, last_epoch,
+     unique_receivers_24h, receiver_txn_count_24h, receiver_amount_sum_24h,
+     receiver_unique_senders_24h, prior_pair_count,
+     device_reuse_count_24h, ip_reuse_count_24h, pattern_version) = row
     first_time_counterparty = prior_pair_count == 0
 
-    # Query 4 — Device/IP reuse (combined into one query when both present)
-    device_reuse_count_24h = 0
-    ip_reuse_count_24h = 0
-    if device_id and ip_address:
-        cursor = await db.execute(
-            """SELECT
-                   (SELECT COUNT(DISTINCT sender_id) FROM transactions
-                    WHERE device_id = ? AND timestamp >= datetime(?, '-24 hours') AND sender_id != ?),
-                   (SELECT COUNT(DISTINCT sender_id) FROM transactions
-                    WHERE ip_address = ? AND timestamp >= datetime(?, '-24 hours') AND sender_id != ?)""",
-            (device_id, now, sender_id, ip_address, now, sender_id),
-        )
-        reuse_row = await cursor.fetchone()
-        device_reuse_count_24h = reuse_row[0]
-        ip_reuse_count_24h = reuse_row[1]
-    elif device_id:
-        cursor = await db.execute(
-            """SELECT COUNT(DISTINCT sender_id) FROM transactions
-               WHERE device_id = ? AND timestamp >= datetime(?, '-24 hours') AND sender_id != ?""",
-            (device_id, now, sender_id),
-        )
-        device_reuse_count_24h = (await cursor.fetchone())[0]
-    elif ip_address:
-        cursor = await db.execute(
-            """SELECT COUNT(DISTINCT sender_id) FROM transactions
-               WHERE ip_address = ? AND timestamp >= datetime(?, '-24 hours') AND sender_id != ?""",
-            (ip_address, now, sender_id),
-        )
-        ip_reuse_count_24h = (await cursor.fetchone())[0]
-
-    # Time since last transaction from sender (computed from MAX(timestamp) in query 1)
-    if last_ts:
-        try:
-            last_dt = datetime.fromisoformat(last_ts)
-            delta = (datetime.utcnow() - last_dt).total_seconds() / 60.0
-            time_since_last = min(delta, 1440)  # cap at 24 hours
-        except (ValueError, TypeError):
-            time_since_last = 60  # default
+    # Time since last transaction from sender (from MAX(ts_epoch) above)
+    if last_epoch is not None:
+        time_since_last = min((now - last_epoch) / 60.0, 1440)  # cap at 24 hours
     else:
         time_since_last = 60  # first transaction from this sender
 
+    pattern_index = await get_pattern_index(db, pattern_version)
+
     return {
         "sender_txn_count_1h": txn_count_1h,
         "sender_txn_count_24h": txn_count_24h,
@@ -491,6 +568,7 @@ async def _compute_velocity_features(db, sender_id: str, receiver_id: str,
         "first_time_counterparty": first_time_counterparty,
         "device_reuse_count_24h": device_reuse_count_24h,
         "ip_reuse_count_24h": ip_reuse_count_24h,
+        **pattern_features_from_index(pattern_index, sender_id, receiver_id),
     }
 
 
@@ -499,80 +577,71 @@ async def _compute_velocity_features(db, sender_id: str, receiver_id: str,
 async def create_transaction(txn: TransactionIn):
     """Ingest a transaction and run risk scoring."""
     txn_id = str(uuid4())
-    timestamp = datetime.utcnow().isoformat()
+    now = _time_mod.time()
+    timestamp = datetime.fromtimestamp(now, timezone.utc).replace(tzinfo=None).isoformat()
+    ts_epoch = int(now)
 
     async with get_db() as db:
-        # 0. Compute velocity features from sender history
-        velocity = await _compute_velocity_features(
+        # 0. Velocity, abuse and pattern features (feedback loop from graph
+        #    mining) in one query
+        features = await _compute_all_features(
             db,
             sender_id=txn.sender_id,
             receiver_id=txn.receiver_id,
             device_id=txn.device_id,
             ip_address=txn.ip_address,
+            now_epoch=ts_epoch,
         )
 
-        # 0b. Compute pattern-derived features (feedback loop from graph mining)
-        pattern_feats = await compute_pattern_features(
-            db, sender_id=txn.sender_id, receiver_id=txn.receiver_id,
-        )
+    # Score the transaction (with velocity + pattern context). No pooled
+    # connection is held while waiting on the batcher, so concurrent
+    # requests can fill a batch without starving other endpoints.
+    txn_dict = {
+        "txn_id": txn_id,
+        "amount": txn.amount,
+        "currency": txn.currency,
+        "sender_id": txn.sender_id,
+        "receiver_id": txn.receiver_id,
+        "txn_type": txn.txn_type,
+        "channel": txn.channel,
+        "ip_address": txn.ip_address,
+        "device_id": txn.device_id,
+        "metadata": txn.metadata,
+        **features,
+    }
+    try:
+        risk_result = await get_score_batcher().submit(txn_dict)
+    except RuntimeError as exc:
+        raise HTTPException(
+            status_code=503,
+            detail=str(exc),
+        ) from exc
+    flagged = risk_result.decision != "approve"
 
-        # Score the transaction (with velocity + pattern context)
-        txn_dict = {
-            "txn_id": txn_id,
-            "amount": txn.amount,
-            "currency": txn.currency,
-            "sender_id": txn.sender_id,
-            "receiver_id": txn.receiver_id,
-            "txn_type": txn.txn_type,
-            "channel": txn.channel,
-            "ip_address": txn.ip_address,
-            "device_id": txn.device_id,
-            "metadata": txn.metadata,
-            **velocity,
-            **pattern_feats,
-        }
-        try:
-            risk_result = score_transaction(txn_dict)
-        except RuntimeError as exc:
-            raise HTTPException(
-                status_code=503,
-                detail=str(exc),
-            ) from exc
-        flagged = risk_result.decision != "approve"
-
-        # 1. Store transaction
+    case_id = str(uuid4()) if flagged else None
+    priority = "high" if risk_result.decision == "block" else "medium"
+
+    async with get_db() as db:
+        # 1-3. Store transaction + risk result (+ case if flagged) in one
+        # statement; the txn_ingest view's trigger fans it out to the tables.
         await db.execute(
-            """INSERT INTO transactions
-               (txn_id, timestamp, amount, currency, sender_id, receiver_id, txn_type, channel, ip_address, device_id, is_fraud_ground_truth, metadata)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            """INSERT INTO txn_ingest
+               (txn_id, timestamp, amount, currency, sender_id, receiver_id, txn_type, channel,
+                ip_address, device_id, is_fraud_ground_truth, metadata, ts_epoch,
+                scored_at, risk_score, flagged, threshold_used, model_version, features,
+                matched_patterns, case_id, priority)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
             (txn_id, timestamp, txn.amount, txn.currency, txn.sender_id, txn.receiver_id,
              txn.txn_type, txn.channel, txn.ip_address, txn.device_id,
              1 if txn.is_fraud_ground_truth else 0 if txn.is_fraud_ground_truth is not None else None,
-             json.dumps(txn.metadata) if txn.metadata else None),
+             to_json(txn.metadata) if txn.metadata else None, ts_epoch,
+             risk_result.computed_at, risk_result.score, 1 if flagged else 0,
+             _REVIEW_THRESHOLD, risk_result.model_version,
+             to_json(risk_result.features) if risk_result.features else None,
+             to_json(risk_result.reasons) if risk_result.reasons else None,
+             case_id, priority),
         )
 
-        # 2. Store risk result
-        await db.execute(
-            """INSERT INTO risk_results
-               (txn_id, timestamp, risk_score, flagged, threshold_used, model_version, features, matched_patterns)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-            (txn_id, risk_result.computed_at, risk_result.score, 1 if flagged else 0,
-             THRESHOLDS["review"], risk_result.model_version,
-             json.dumps(risk_result.features) if risk_result.features else None,
-             json.dumps(risk_result.reasons) if risk_result.reasons else None),
-        )
-
-        # 3. Auto-create case if flagged
-        if flagged:
-            case_id = str(uuid4())
-            priority = "high" if risk_result.decision == "block" else "medium"
-            await db.execute(
-                """INSERT INTO cases
-                   (case_id, txn_id, status, created_at, priority, risk_score)
-                   VALUES (?, ?, ?, ?, ?, ?)""",
-                (case_id, txn_id, "open", timestamp, priority, risk_result.score),
-            )
-
         await db.commit()
 
     # Publish SSE event so Orbital Greenhouse UI receives it
@@ -613,7 +682,7 @@ async def create_transaction(txn: TransactionIn):
             "timestamp": timestamp,
             "metadata": txn.metadata,
         }
-        asyncio.create_task(_auto_explain_case(
+        _spawn_background(_auto_explain_case(
             case_id=case_id,
             txn_id=txn_id,
             txn_data=txn_for_explain,
@@ -651,18 +720,11 @@ async def list_transactions(limit: int = Query(default=50, ge=0, le=1000)):
                FROM transactions t
                LEFT JOIN risk_results r ON t.txn_id = r.txn_id
                ORDER BY t.timestamp DESC LIMIT ?""",
-            (THRESHOLDS["block"], limit),
+            (_BLOCK_THRESHOLD, limit),
         )
         rows = await cursor.fetchall()
 
-    return [
-        TransactionOut(
-            txn_id=r[0], timestamp=r[1], amount=r[2], currency=r[3],
-            sender_id=r[4], receiver_id=r[5], txn_type=r[6], channel=r[7],
-            risk_score=r[8], decision=r[9],
-        )
-        for r in rows
-    ]
+    return _json_list_response(_TXN_LIST_ADAPTER, _TXN_FIELDS, rows)
 
 
 # --- Cases ---
@@ -682,10 +744,7 @@ async def list_cases(status: Literal["open", "in_review", "closed"] | None = Non
             )
         rows = await cursor.fetchall()
 
-    return [
-        CaseOut(case_id=r[0], txn_id=r[1], status=r[2], created_at=r[3], priority=r[4], risk_score=r[5])
-        for r in rows
-    ]
+    return _json_list_response(_CASE_LIST_ADAPTER, _CASE_FIELDS, rows)
 
 
 @app.post("/cases/{case_id}/label")
@@ -693,8 +752,7 @@ async def label_case(case_id: str, label_in: LabelIn):
     """Analyst labels a case as fraud/legit."""
     async with get_db() as db:
         # Check case exists
-        cursor = await db.execute("SELECT txn_id, status FROM cases WHERE case_id = ?", (case_id,))
-        row = await cursor.fetchone()
+        row = await fetch_one(db, "SELECT txn_id, status FROM cases WHERE case_id = ?", (case_id,))
         if not row:
             raise HTTPException(status_code=404, detail="Case not found")
 
@@ -704,7 +762,7 @@ async def label_case(case_id: str, label_in: LabelIn):
 
         # Insert label
         label_id = str(uuid4())
-        labeled_at = datetime.utcnow().isoformat()
+        labeled_at = _now_iso()
         new_status = "closed" if label_in.decision in ("fraud", "not_fraud") else "in_review"
 
         await db.execute(
@@ -742,14 +800,12 @@ async def label_case(case_id: str, label_in: LabelIn):
                     return
 
                 async with get_db() as db2:
-                    cursor = await db2.execute(
-                        "SELECT COUNT(*) FROM analyst_labels WHERE decision = 'fraud'"
-                    )
-                    fraud_count = (await cursor.fetchone())[0]
-                    cursor = await db2.execute(
-                        "SELECT COUNT(*) FROM analyst_labels WHERE decision = 'not_fraud'"
+                    fraud_count, legit_count = await fetch_one(
+                        db2,
+                        """SELECT COUNT(CASE WHEN decision = 'fraud' THEN 1 END),
+                                  COUNT(CASE WHEN decision = 'not_fraud' THEN 1 END)
+                           FROM analyst_labels""",
                     )
-                    legit_count = (await cursor.fetchone())[0]
 
                 if fraud_count >= MIN_SAMPLES_PER_CLASS and legit_count >= MIN_SAMPLES_PER_CLASS:
                     async with _retrain_lock:
@@ -759,7 +815,7 @@ async def label_case(case_id: str, label_in: LabelIn):
             except Exception as e:
                 logger.warning(f"Auto-retrain skipped: {e}")
 
-        asyncio.create_task(_maybe_auto_retrain())
+        _spawn_background(_maybe_auto_retrain())
 
     return {"label_id": label_id, "case_id": case_id, "new_status": new_status}
 
@@ -795,6 +851,19 @@ async def suggested_cases(limit: int = Query(default=10, ge=0, le=1000)):
     ]
 
 
+# One row per case: the case, its transaction and its risk result. The
+# transaction / risk columns are NULL when those rows are missing.
+_CASE_CONTEXT_SQL = """
+    SELECT c.txn_id, c.risk_score, c.explanation,
+           t.txn_id, t.amount, t.currency, t.sender_id, t.receiver_id,
+           t.txn_type, t.channel, t.timestamp, t.metadata,
+           r.txn_id, r.risk_score, r.features, r.matched_patterns, r.model_version
+    FROM cases c
+    LEFT JOIN transactions t ON t.txn_id = c.txn_id
+    LEFT JOIN risk_results r ON r.txn_id = c.txn_id
+    WHERE c.case_id = ?"""
+
+
 @app.get("/cases/{case_id}/explain")
 async def explain_case_endpoint(case_id: str):
     """Return the AI-generated explanation for a flagged case.
@@ -804,92 +873,67 @@ async def explain_case_endpoint(case_id: str):
     task hasn't finished yet, it falls back to on-demand generation.
     """
     async with get_db() as db:
-        # Get case (including pre-computed explanation)
-        cursor = await db.execute(
-            "SELECT txn_id, risk_score, priority, explanation FROM cases WHERE case_id = ?",
-            (case_id,),
-        )
-        case_row = await cursor.fetchone()
-        if not case_row:
+        # Case (including pre-computed explanation), its transaction and risk
+        # result in one lookup
+        row = await fetch_one(db, _CASE_CONTEXT_SQL, (case_id,))
+        if not row:
             raise HTTPException(status_code=404, detail="Case not found")
 
-        txn_id, case_risk_score, priority, cached_explanation = case_row
+        (txn_id, case_risk_score, cached_explanation,
+         txn_found, amount, currency, sender_id, receiver_id, txn_type, channel, timestamp, metadata,
+         risk_found, result_score, features_json, reasons_json, result_model_version) = row
 
         # Return cached explanation if available (instant response)
         if cached_explanation:
             try:
-                explanation = json.loads(cached_explanation)
+                explanation = orjson.loads(cached_explanation)
                 return {"case_id": case_id, "txn_id": txn_id, "risk_score": case_risk_score, **explanation}
             except (json.JSONDecodeError, TypeError):
                 pass
 
         # Fallback: generate on-demand if background task hasn't completed yet
-        cursor = await db.execute(
-            """SELECT txn_id, amount, currency, sender_id, receiver_id,
-                      txn_type, channel, timestamp, metadata
-               FROM transactions WHERE txn_id = ?""",
-            (txn_id,),
-        )
-        txn_row = await cursor.fetchone()
-        if not txn_row:
+        if txn_found is None:
             raise HTTPException(status_code=404, detail="Transaction not found")
 
         txn = {
-            "txn_id": txn_row[0], "amount": txn_row[1], "currency": txn_row[2],
-            "sender_id": txn_row[3], "receiver_id": txn_row[4],
-            "txn_type": txn_row[5], "channel": txn_row[6], "timestamp": txn_row[7],
+            "txn_id": txn_id, "amount": amount, "currency": currency,
+            "sender_id": sender_id, "receiver_id": receiver_id,
+            "txn_type": txn_type, "channel": channel, "timestamp": timestamp,
             "metadata": None,
         }
-        if txn_row[8]:
+        if metadata:
             try:
-                txn["metadata"] = json.loads(txn_row[8])
+                txn["metadata"] = orjson.loads(metadata)
             except (json.JSONDecodeError, TypeError):
                 pass
 
-        cursor = await db.execute(
-            "SELECT risk_score, features, matched_patterns, model_version FROM risk_results WHERE txn_id = ?",
-            (txn_id,),
-        )
-        risk_row = await cursor.fetchone()
-
         risk_score = case_risk_score or 0
         features = {}
         reasons = []
         model_version = "missing"
 
-        if risk_row:
-            risk_score = risk_row[0] or risk_score
-            if risk_row[1]:
+        if risk_found is not None:
+            risk_score = result_score or risk_score
+            if features_json:
                 try:
-                    features = json.loads(risk_row[1])
+                    features = orjson.loads(features_json)
                 except (json.JSONDecodeError, TypeError):
                     pass
-            if risk_row[2]:
+            if reasons_json:
                 try:
-                    reasons = json.loads(risk_row[2])
+                    reasons = orjson.loads(reasons_json)
                 except (json.JSONDecodeError, TypeError):
                     pass
-            model_version = risk_row[3] or model_version
+            model_version = result_model_version or model_version
 
-        if risk_score >= THRESHOLDS["block"]:
+        if risk_score >= _BLOCK_THRESHOLD:
             decision = "block"
-        elif risk_score >= THRESHOLDS["review"]:
+        elif risk_score >= _REVIEW_THRESHOLD:
             decision = "review"
         else:
             decision = "approve"
 
-        cursor = await db.execute(
-            "SELECT name, pattern_type, confidence, description FROM pattern_cards WHERE status = 'active' LIMIT 20"
-        )
-        all_patterns = [
-            {"name": r[0], "pattern_type": r[1], "confidence": r[2], "description": r[3]}
-            for r in await cursor.fetchall()
-        ]
-        related_patterns = [
-            p for p in all_patterns
-            if txn["sender_id"] in (p.get("description") or "")
-            or txn["receiver_id"] in (p.get("description") or "")
-        ]
+        related_patterns = await _fetch_related_patterns(db, sender_id, receiver_id)
 
     # Run in executor to avoid blocking the event loop — explain_case()
     # makes synchronous HTTP calls to Ollama which can take 30+ seconds.
@@ -956,104 +1000,55 @@ async def explain_case_stream(case_id: str):
     Falls back to non-streaming explain_case if Ollama streaming fails.
     """
     async with get_db() as db:
-        cursor = await db.execute(
-            "SELECT txn_id, risk_score FROM cases WHERE case_id = ?", (case_id,),
-        )
-        case_row = await cursor.fetchone()
-        if not case_row:
+        row = await fetch_one(db, _CASE_CONTEXT_SQL, (case_id,))
+        if not row:
             raise HTTPException(status_code=404, detail="Case not found")
 
-        txn_id, case_risk_score = case_row
-
-        cursor = await db.execute(
-            """SELECT amount, currency, sender_id, receiver_id, txn_type, channel
-               FROM transactions WHERE txn_id = ?""",
-            (txn_id,),
-        )
-        txn_row = await cursor.fetchone()
-        if not txn_row:
+        (_, case_risk_score, _,
+         txn_found, amount, currency, sender_id, receiver_id, txn_type, channel, _, _,
+         risk_found, _, features_json, reasons_json, result_model_version) = row
+        if txn_found is None:
             raise HTTPException(status_code=404, detail="Transaction not found")
 
-        cursor = await db.execute(
-            "SELECT features, matched_patterns, model_version FROM risk_results WHERE txn_id = ?",
-            (txn_id,),
-        )
-        risk_row = await cursor.fetchone()
+        # Same related-pattern lookup as the non-streaming endpoint
+        related_patterns = await _fetch_related_patterns(db, sender_id, receiver_id)
 
     features = {}
     reasons = []
     model_version = "missing"
-    if risk_row:
+    if risk_found is not None:
         try:
-            features = json.loads(risk_row[0]) if risk_row[0] else {}
+            features = orjson.loads(features_json) if features_json else {}
         except (json.JSONDecodeError, TypeError):
             pass
         try:
-            reasons = json.loads(risk_row[1]) if risk_row[1] else []
+            reasons = orjson.loads(reasons_json) if reasons_json else []
         except (json.JSONDecodeError, TypeError):
             pass
-        model_version = risk_row[2] or model_version
+        model_version = result_model_version or model_version
 
     risk_score = case_risk_score or 0
-    decision = "block" if risk_score >= THRESHOLDS["block"] else "review" if risk_score >= THRESHOLDS["review"] else "approve"
+    decision = "block" if risk_score >= _BLOCK_THRESHOLD else "review" if risk_score >= _REVIEW_THRESHOLD else "approve"
 
     txn = {
-        "amount": txn_row[0], "currency": txn_row[1], "sender_id": txn_row[2],
-        "receiver_id": txn_row[3], "txn_type": txn_row[4], "channel": txn_row[5],
+        "amount": amount, "currency": currency, "sender_id": sender_id,
+        "receiver_id": receiver_id, "txn_type": txn_type, "channel": channel,
     }
 
-    # Fetch related patterns (same logic as non-streaming endpoint)
-    related_patterns = []
-    async with get_db() as db:
-        cursor = await db.execute(
-            "SELECT name, pattern_type, confidence, description FROM pattern_cards WHERE status = 'active' LIMIT 20"
-        )
-        all_patterns = [
-            {"name": r[0], "pattern_type": r[1], "confidence": r[2], "description": r[3]}
-            for r in await cursor.fetchall()
-        ]
-        related_patterns = [
-            p for p in all_patterns
-            if txn["sender_id"] in (p.get("description") or "")
-            or txn["receiver_id"] in (p.get("description") or "")
-        ]
 
     prompt = _build_llm_prompt(txn, risk_score, decision, features, reasons, related_patterns, model_version)
 
     async def generate():
-        # Use asyncio.Queue as bridge between sync Ollama iterator and async generator
-        # for true chunk-by-chunk streaming (no materialization)
-        queue: asyncio.Queue = asyncio.Queue()
-        sentinel = object()
-
-        def _stream_to_queue():
-            try:
-                for chunk, done in _call_ollama_stream(prompt):
-                    queue.put_nowait((chunk, done))
-            except Exception as e:
-                queue.put_nowait((f"Error: {e}", True))
-            finally:
-                queue.put_nowait((sentinel, True))
-
-        loop = asyncio.get_running_loop()
-        loop.run_in_executor(None, _stream_to_queue)
-
+        # Chunks are read from Ollama on the event loop and forwarded as they
+        # arrive (no materialization, no thread/queue bridge)
         try:
-            while True:
-                item = await asyncio.wait_for(queue.get(), timeout=60)
-                chunk, done = item
-                if chunk is sentinel:
-                    yield "data: [DONE]\n\n"
-                    break
-                yield f"data: {json.dumps({'text': chunk, 'done': done})}\n\n"
-        except asyncio.TimeoutError:
-            logger.warning("explain-stream timed out waiting for Ollama chunks (case %s)", case_id[:8])
-            yield f"data: {json.dumps({'text': 'Error: LLM streaming timed out.', 'done': True})}\n\n"
-            yield "data: [DONE]\n\n"
+            async for chunk, done in _call_ollama_stream(prompt):
+                yield _sse_frame({"text": chunk, "done": done})
+            yield b"data: [DONE]\n\n"
         except Exception as e:
             logger.error("explain-stream error for case %s: %s", case_id[:8], e)
-            yield f"data: {json.dumps({'text': f'Error: {e}', 'done': True})}\n\n"
-            yield "data: [DONE]\n\n"
+            yield _sse_frame({"text": f"Error: {e}", "done": True})
+            yield b"data: [DONE]\n\n"
 
     return StreamingResponse(generate(), media_type="text/event-stream")
 
@@ -1063,25 +1058,30 @@ async def explain_case_stream(case_id: str):
 async def get_metrics():
     """Get current system metrics with real precision/recall from labels."""
     async with get_db() as db:
-        total = (await (await db.execute("SELECT COUNT(*) FROM transactions")).fetchone())[0]
-        flagged = (await (await db.execute("SELECT COUNT(*) FROM risk_results WHERE flagged = 1")).fetchone())[0]
-        cases_open = (await (await db.execute("SELECT COUNT(*) FROM cases WHERE status = 'open' OR status = 'in_review'")).fetchone())[0]
-        cases_closed = (await (await db.execute("SELECT COUNT(*) FROM cases WHERE status = 'closed'")).fetchone())[0]
-
-        # Compute real precision/recall from analyst labels vs risk_results
-        # Single SQL query with conditional aggregation (O(1) memory)
-        cursor = await db.execute(
-            """SELECT
-                   SUM(CASE WHEN al.decision = 'fraud' AND r.flagged = 1 THEN 1 ELSE 0 END),
-                   SUM(CASE WHEN al.decision = 'not_fraud' AND r.flagged = 1 THEN 1 ELSE 0 END),
-                   SUM(CASE WHEN al.decision = 'fraud' AND r.flagged = 0 THEN 1 ELSE 0 END),
-                   SUM(CASE WHEN al.decision = 'not_fraud' AND r.flagged = 0 THEN 1 ELSE 0 END),
-                   COUNT(*)
-               FROM analyst_labels al
-               JOIN risk_results r ON al.txn_id = r.txn_id
-               WHERE al.decision IN ('fraud', 'not_fraud')"""
+        # Volume counts (trigger-maintained counters, so no table scans) and
+        # real precision/recall (analyst labels vs risk_results, via
+        # conditional aggregation) in one statement.
+        (total, flagged, cases_open, cases_closed,
+         *metrics_row) = await fetch_one(
+            db,
+            """SELECT k.total_txns, k.flagged_txns, k.cases_open, k.cases_closed,
+                      m.tp, m.fp, m.fn, m.tn, m.n
+               FROM
+                   (SELECT COALESCE(SUM(CASE WHEN name = 'total_txns' THEN value END), 0) AS total_txns,
+                           COALESCE(SUM(CASE WHEN name = 'flagged_txns' THEN value END), 0) AS flagged_txns,
+                           COALESCE(SUM(CASE WHEN name = 'cases_open' THEN value END), 0) AS cases_open,
+                           COALESCE(SUM(CASE WHEN name = 'cases_closed' THEN value END), 0) AS cases_closed
+                    FROM counters) AS k,
+                   (SELECT
+                        SUM(CASE WHEN al.decision = 'fraud' AND r.flagged = 1 THEN 1 ELSE 0 END) AS tp,
+                        SUM(CASE WHEN al.decision = 'not_fraud' AND r.flagged = 1 THEN 1 ELSE 0 END) AS fp,
+                        SUM(CASE WHEN al.decision = 'fraud' AND r.flagged = 0 THEN 1 ELSE 0 END) AS fn,
+                        SUM(CASE WHEN al.decision = 'not_fraud' AND r.flagged = 0 THEN 1 ELSE 0 END) AS tn,
+                        COUNT(*) AS n
+                    FROM analyst_labels al
+                    JOIN risk_results r ON al.txn_id = r.txn_id
+                    WHERE al.decision IN ('fraud', 'not_fraud')) AS m"""
         )
-        metrics_row = await cursor.fetchone()
 
     precision = None
     recall = None
@@ -1117,6 +1117,56 @@ async def get_metrics():
 
 
 # --- Shared Retrain Helper ---
+# Feature names with a parallel row of defaults, so a stored feature dict is
+# turned into a row by map(dict.get, ...) at C level.
+_FEATURE_NAMES = tuple(FEATURE_NAMES)
+_FEATURE_DEFAULTS = (0.0,) * len(_FEATURE_NAMES)
+
+
+def _feature_row(feat_dict: dict) -> tuple[float, ...]:
+    """Values of feat_dict in FEATURE_NAMES order, 0.0 for missing names."""
+    return tuple(map(feat_dict.get, _FEATURE_NAMES, _FEATURE_DEFAULTS))
+
+
+def _build_training_matrix(rows) -> tuple[np.ndarray, np.ndarray]:
+    """Build (X, y) from (amount, txn_type, channel, is_fraud, features_json) rows.
+
+    Stored risk_results features are used when present; otherwise they are
+    recomputed from the transaction. X is filled in place as float32
+    (XGBoost trains on float32 anyway) rather than built from nested lists.
+    """
+    X = np.zeros((len(rows), len(_FEATURE_NAMES)), dtype=np.float32)
+    for i, (amount, txn_type, channel, _, features_json) in enumerate(rows):
+        feat_dict = None
+        if features_json:
+            try:
+                feat_dict = orjson.loads(features_json)
+            except json.JSONDecodeError:
+                pass
+        if feat_dict is None:
+            X[i] = _feature_row(compute_training_features(amount, txn_type, channel))
+        else:
+            X[i] = _feature_row(feat_dict)
+
+    y = np.fromiter((1 if row[3] else 0 for row in rows), dtype=np.int8, count=len(rows))
+    return X, y
+
+
+# Training rows in _build_training_matrix order: analyst labels, or the
+# simulator's ground truth
+_TRAIN_LABELED_SQL = """
+    SELECT t.amount, t.txn_type, t.channel, al.decision = 'fraud', r.features
+    FROM analyst_labels al
+    JOIN transactions t ON al.txn_id = t.txn_id
+    LEFT JOIN risk_results r ON t.txn_id = r.txn_id
+    WHERE al.decision IN ('fraud', 'not_fraud')"""
+_TRAIN_GROUND_TRUTH_SQL = """
+    SELECT t.amount, t.txn_type, t.channel, t.is_fraud_ground_truth, r.features
+    FROM transactions t
+    LEFT JOIN risk_results r ON t.txn_id = r.txn_id
+    WHERE t.is_fraud_ground_truth IS NOT NULL"""
+
+
 async def _do_retrain(write_snapshot: bool = True) -> dict:
     """Shared retrain logic used by both /retrain endpoint and guardian.
 
@@ -1128,16 +1178,7 @@ async def _do_retrain(write_snapshot: bool = True) -> dict:
         Training result dict.
     """
     async with get_db() as db:
-        cursor = await db.execute(
-            """SELECT t.txn_id, t.amount, t.txn_type, t.channel, t.sender_id,
-                      t.timestamp, al.decision,
-                      r.features
-               FROM analyst_labels al
-               JOIN transactions t ON al.txn_id = t.txn_id
-               LEFT JOIN risk_results r ON t.txn_id = r.txn_id
-               WHERE al.decision IN ('fraud', 'not_fraud')"""
-        )
-        rows = await cursor.fetchall()
+        rows = await db.execute_fetchall(_TRAIN_LABELED_SQL)
 
     if len(rows) < MIN_SAMPLES_PER_CLASS * 2:
         return {
@@ -1145,41 +1186,19 @@ async def _do_retrain(write_snapshot: bool = True) -> dict:
             "error": f"Need at least {MIN_SAMPLES_PER_CLASS * 2} labeled samples, have {len(rows)}",
         }
 
-    X_list = []
-    y_list = []
-
-    for row in rows:
-        txn_id, amount, txn_type, channel, sender_id, ts, decision, features_json = row
-
-        if features_json:
-            try:
-                stored_features = json.loads(features_json)
-                feature_vec = [stored_features.get(name, 0.0) for name in FEATURE_NAMES]
-            except (json.JSONDecodeError, KeyError):
-                feat_dict = compute_training_features(amount, txn_type, channel)
-                feature_vec = [feat_dict.get(name, 0.0) for name in FEATURE_NAMES]
-        else:
-            feat_dict = compute_training_features(amount, txn_type, channel)
-            feature_vec = [feat_dict.get(name, 0.0) for name in FEATURE_NAMES]
-
-        X_list.append(feature_vec)
-        y_list.append(1 if decision == "fraud" else 0)
-
-    X = np.array(X_list)
-    y = np.array(y_list)
+    X, y = _build_training_matrix(rows)
 
     result = train_model(X, y)
 
     if result.get("trained") and write_snapshot:
-        reload_model()
+        _reload_model()
 
         async with get_db() as db:
             snapshot_id = str(uuid4())
             await db.execute(
-                """INSERT INTO metric_snapshots (snapshot_id, timestamp, model_version, metrics)
-                   VALUES (?, ?, ?, ?)""",
-                (snapshot_id, datetime.utcnow().isoformat(), result["version"],
-                 json.dumps(result["metrics"])),
+                SNAPSHOT_INSERT_SQL,
+                (snapshot_id, _now_iso(), result["version"],
+                 to_json(result["metrics"])),
             )
             await db.commit()
 
@@ -1187,7 +1206,7 @@ async def _do_retrain(write_snapshot: bool = True) -> dict:
             "type": "retrain",
             "model_version": result["version"],
             "metrics": result.get("metrics", {}),
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _now_iso(),
         })
 
     return result
@@ -1214,15 +1233,7 @@ async def retrain_from_ground_truth():
     Useful for demo: pre-populate with simulated data, then retrain.
     """
     async with get_db() as db:
-        cursor = await db.execute(
-            """SELECT t.txn_id, t.amount, t.txn_type, t.channel, t.sender_id,
-                      t.timestamp, t.is_fraud_ground_truth,
-                      r.features
-               FROM transactions t
-               LEFT JOIN risk_results r ON t.txn_id = r.txn_id
-               WHERE t.is_fraud_ground_truth IS NOT NULL"""
-        )
-        rows = await cursor.fetchall()
+        rows = await db.execute_fetchall(_TRAIN_GROUND_TRUTH_SQL)
 
     if len(rows) < MIN_SAMPLES_PER_CLASS * 2:
         return {
@@ -1230,41 +1241,19 @@ async def retrain_from_ground_truth():
             "error": f"Need at least {MIN_SAMPLES_PER_CLASS * 2} labeled samples, have {len(rows)}",
         }
 
-    X_list = []
-    y_list = []
-
-    for row in rows:
-        txn_id, amount, txn_type, channel, sender_id, ts, is_fraud, features_json = row
-
-        if features_json:
-            try:
-                stored_features = json.loads(features_json)
-                feature_vec = [stored_features.get(name, 0.0) for name in FEATURE_NAMES]
-            except (json.JSONDecodeError, KeyError):
-                feat_dict = compute_training_features(amount, txn_type, channel)
-                feature_vec = [feat_dict.get(name, 0.0) for name in FEATURE_NAMES]
-        else:
-            feat_dict = compute_training_features(amount, txn_type, channel)
-            feature_vec = [feat_dict.get(name, 0.0) for name in FEATURE_NAMES]
-
-        X_list.append(feature_vec)
-        y_list.append(1 if is_fraud else 0)
-
-    X = np.array(X_list)
-    y = np.array(y_list)
+    X, y = _build_training_matrix(rows)
 
     result = train_model(X, y)
 
     if result.get("trained"):
-        reload_model()
+        _reload_model()
 
         async with get_db() as db:
             snapshot_id = str(uuid4())
             await db.execute(
-                """INSERT INTO metric_snapshots (snapshot_id, timestamp, model_version, metrics)
-                   VALUES (?, ?, ?, ?)""",
-                (snapshot_id, datetime.utcnow().isoformat(), result["version"],
-                 json.dumps(result["metrics"])),
+                SNAPSHOT_INSERT_SQL,
+                (snapshot_id, _now_iso(), result["version"],
+                 to_json(result["metrics"])),
             )
             await db.commit()
 
@@ -1273,7 +1262,7 @@ async def retrain_from_ground_truth():
             "model_version": result["version"],
             "metrics": result.get("metrics", {}),
             "source": "ground_truth",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _now_iso(),
         })
 
     return result
@@ -1286,14 +1275,7 @@ async def trigger_mining():
     async with get_db() as db:
         patterns = await run_mining_job_async(db)
 
-    for p in patterns:
-        _publish_event({
-            "type": "pattern",
-            "name": p.name,
-            "pattern_type": p.pattern_type,
-            "confidence": p.confidence,
-            "timestamp": datetime.utcnow().isoformat(),
-        })
+    _publish_patterns(patterns)
 
     return {
         "patterns_found": len(patterns),
@@ -1309,44 +1291,63 @@ async def trigger_mining():
 async def list_metric_snapshots(limit: int = Query(default=20, ge=0, le=1000)):
     """List metric snapshots (for trend charts)."""
     async with get_db() as db:
-        cursor = await db.execute(
+        rows = await db.execute_fetchall(
             "SELECT snapshot_id, timestamp, model_version, metrics FROM metric_snapshots ORDER BY timestamp ASC LIMIT ?",
             (limit,),
         )
-        rows = await cursor.fetchall()
 
     results = []
     for r in rows:
-        metrics = {}
+        item = {"snapshot_id": r[0], "timestamp": r[1], "model_version": r[2]}
+        metrics = None
         if r[3]:
             try:
-                metrics = json.loads(r[3])
-            except (json.JSONDecodeError, TypeError):
-                pass
-        results.append({
-            "snapshot_id": r[0],
-            "timestamp": r[1],
-            "model_version": r[2],
-            **metrics,
-        })
-    return results
+                metrics = orjson.loads(r[3])
+            except orjson.JSONDecodeError:
+                pass  # legacy rows may hold NaN/Infinity from stdlib json
+        if isinstance(metrics, dict):
+            # The row's own columns win over same-named metric keys
+            for key, value in metrics.items():
+                item.setdefault(key, value)
+        results.append(item)
+    return ORJSONResponse(results)
 
 
 @app.get("/patterns")
-async def list_patterns(limit: int = Query(default=20, ge=0, le=1000)):
-    """List discovered pattern cards."""
+async def list_patterns(
+    limit: int = Query(default=20, ge=0, le=1000),
+    q: str | None = Query(default=None, max_length=200),
+):
+    """List discovered pattern cards, optionally full-text searched by `q`."""
     async with get_db() as db:
-        cursor = await db.execute(
-            "SELECT pattern_id, name, description, discovered_at, status, pattern_type, confidence FROM pattern_cards ORDER BY discovered_at DESC LIMIT ?",
-            (limit,),
-        )
+        if q and q.strip():
+            try:
+                cursor = await db.execute(
+                    """SELECT p.pattern_id, p.name, p.description, p.discovered_at, p.status, p.pattern_type, p.confidence
+                       FROM pattern_cards_fts f JOIN pattern_cards p ON p.rowid = f.rowid
+                       WHERE pattern_cards_fts MATCH ? ORDER BY f.rank LIMIT ?""",
+                    (fts_query(q), limit),
+                )
+            except sqlite3.OperationalError:
+                # FTS5 not available in this SQLite build
+                cursor = await db.execute(
+                    """SELECT pattern_id, name, description, discovered_at, status, pattern_type, confidence
+                       FROM pattern_cards WHERE name LIKE ?1 OR description LIKE ?1
+                       ORDER BY discovered_at DESC LIMIT ?2""",
+                    (f"%{q.strip()}%", limit),
+                )
+        else:
+            cursor = await db.execute(
+                "SELECT pattern_id, name, description, discovered_at, status, pattern_type, confidence FROM pattern_cards ORDER BY discovered_at DESC LIMIT ?",
+                (limit,),
+            )
         rows = await cursor.fetchall()
 
-    return [
+    return ORJSONResponse([
         {"pattern_id": r[0], "name": r[1], "description": r[2], "discovered_at": r[3],
          "status": r[4], "pattern_type": r[5], "confidence": r[6]}
         for r in rows
-    ]
+    ])
 
 
 # --- Transaction Detail (for UI popups) ---
@@ -1354,7 +1355,8 @@ async def list_patterns(limit: int = Query(default=20, ge=0, le=1000)):
 async def get_transaction(txn_id: str):
     """Get full transaction detail including risk result and case info."""
     async with get_db() as db:
-        cursor = await db.execute(
+        row = await fetch_one(
+            db,
             """SELECT t.txn_id, t.timestamp, t.amount, t.currency, t.sender_id,
                       t.receiver_id, t.txn_type, t.channel, t.ip_address,
                       t.device_id, t.is_fraud_ground_truth, t.metadata,
@@ -1366,7 +1368,11 @@ async def get_transaction(txn_id: str):
                WHERE t.txn_id = ?""",
             (txn_id,),
         )
-        row = await cursor.fetchone()
+        if row:
+            cursor = await db.execute(
+                "SELECT pattern_id FROM txn_pattern_matches WHERE txn_id = ?", (txn_id,),
+            )
+            pattern_ids = [r[0] for r in await cursor.fetchall()]
 
     if not row:
         raise HTTPException(status_code=404, detail="Transaction not found")
@@ -1374,18 +1380,18 @@ async def get_transaction(txn_id: str):
     metadata = None
     if row[11]:
         try:
-            metadata = json.loads(row[11])
-        except (json.JSONDecodeError, TypeError):
+            metadata = orjson.loads(row[11])
+        except orjson.JSONDecodeError:
             metadata = {"raw": row[11]}
 
     features = None
     if row[13]:
         try:
-            features = json.loads(row[13])
-        except (json.JSONDecodeError, TypeError):
+            features = orjson.loads(row[13])
+        except orjson.JSONDecodeError:
             pass
 
-    return {
+    return ORJSONResponse({
         "txn_id": row[0], "timestamp": row[1], "amount": row[2],
         "currency": row[3], "sender_id": row[4], "receiver_id": row[5],
         "txn_type": row[6], "channel": row[7], "ip_address": row[8],
@@ -1394,24 +1400,85 @@ async def get_transaction(txn_id: str):
         "risk_score": row[12], "features": features,
         "matched_patterns": row[14], "model_version": row[15],
         "case_id": row[16], "case_status": row[17], "priority": row[18],
-    }
+        "pattern_ids": pattern_ids,
+    })
 
 
 # --- SSE Event Stream (for Orbital Greenhouse UI) ---
 # In-memory event bus for real-time UI updates
 MAX_SUBSCRIBERS = 50
-_event_subscribers: list[asyncio.Queue] = []
+_event_subscribers: set[asyncio.Queue] = set()
+
+
+def _sse_frame(event: dict) -> bytes:
+    """Encode an event as a ready-to-send SSE frame."""
+    return b"data: " + orjson.dumps(event) + b"\n\n"
 
 
 def _publish_event(event: dict):
     """Publish an event to all SSE subscribers."""
+    if _event_subscribers:
+        _publish_event_bytes(_sse_frame(event))
+
+
+def _publish_event_bytes(frame: bytes):
+    """Put a pre-encoded SSE frame on every subscriber queue.
+
+    The frame is built once and shared by all subscribers; as bytes it is
+    written to each response as-is, with no per-subscriber re-encoding.
+    """
     for queue in _event_subscribers:
         try:
-            queue.put_nowait(event)
+            queue.put_nowait(frame)
         except asyncio.QueueFull:
             logger.warning("SSE subscriber queue full, dropping event")
 
 
+SSE_HEARTBEAT_SECONDS = 15.0
+_heartbeat_task: asyncio.Task | None = None
+
+
+async def _sse_heartbeat():
+    """Send one shared keepalive frame to every subscriber while any are connected.
+
+    A single timer for all streams, instead of a wait_for timeout around
+    every queue.get() in every stream.
+    """
+    while _event_subscribers:
+        await asyncio.sleep(SSE_HEARTBEAT_SECONDS)
+        frame = _sse_frame({"type": "heartbeat", "timestamp": _now_iso()})
+        for queue in _event_subscribers:
+            # A full queue has data in flight, which keeps the stream alive anyway
+            if not queue.full():
+                queue.put_nowait(frame)
+
+
+def _ensure_sse_heartbeat():
+    global _heartbeat_task
+    if (
+        _heartbeat_task is None
+        or _heartbeat_task.done()
+        or _heartbeat_task.get_loop() is not asyncio.get_running_loop()
+    ):
+        _heartbeat_task = asyncio.create_task(_sse_heartbeat())
+
+
+def _publish_patterns(patterns: list) -> None:
+    """Publish one `patterns` event for a whole mining run (no-op if empty)."""
+    if not patterns or not _event_subscribers:
+        return
+    timestamp = _now_iso()
+    _publish_event_bytes(_sse_frame({
+        "type": "patterns",
+        "items": [
+            {"name": p.name, "pattern_type": p.pattern_type,
+             "confidence": p.confidence, "timestamp": timestamp}
+            for p in patterns
+        ],
+        "timestamp": timestamp,
+    }))
+
+
 @app.get("/stream/events")
 async def stream_events():
     """SSE endpoint for real-time system events.
@@ -1421,7 +1488,7 @@ async def stream_events():
     - case_created: new case opened
     - case_labeled: analyst labeled a case
     - retrain: model retrained
-    - pattern: new pattern discovered
+    - patterns: new patterns discovered by one mining run (`items` list)
     """
     if len(_event_subscribers) >= MAX_SUBSCRIBERS:
         raise HTTPException(
@@ -1429,26 +1496,20 @@ async def stream_events():
             detail=f"Too many SSE subscribers (max {MAX_SUBSCRIBERS})",
         )
     queue: asyncio.Queue = asyncio.Queue(maxsize=100)
-    _event_subscribers.append(queue)
+    _event_subscribers.add(queue)
+    _ensure_sse_heartbeat()
 
     async def generate():
         try:
             # Send initial heartbeat
-            yield f"data: {json.dumps({'type': 'connected', 'timestamp': datetime.utcnow().isoformat()})}\n\n"
+            yield _sse_frame({"type": "connected", "timestamp": _now_iso()})
+            # Keepalives arrive on the queue from _sse_heartbeat
             while True:
-                try:
-                    event = await asyncio.wait_for(queue.get(), timeout=15.0)
-                    yield f"data: {json.dumps(event)}\n\n"
-                except asyncio.TimeoutError:
-                    # Send keepalive
-                    yield f"data: {json.dumps({'type': 'heartbeat', 'timestamp': datetime.utcnow().isoformat()})}\n\n"
+                yield await queue.get()
         except asyncio.CancelledError:
             pass
         finally:
-            try:
-                _event_subscribers.remove(queue)
-            except ValueError:
-                pass
+            _event_subscribers.discard(queue)
 
     return StreamingResponse(generate(), media_type="text/event-stream")
 
@@ -1469,6 +1530,13 @@ _sim_config: dict = {
 }
 
 
+# In-flight simulator POSTs. Sends are spawned rather than awaited so the
+# TPS pacing is not stretched by slow /transactions calls.
+_SIM_MAX_IN_FLIGHT = 16
+_SIM_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=_SIM_MAX_IN_FLIGHT)
+_SIM_TIMEOUT = httpx.Timeout(5.0)
+
+
 class SimulatorConfig(BaseModel):
     tps: float = 1.0
     fraud_rate: float = 0.10
@@ -1488,50 +1556,47 @@ async def _run_embedded_simulator():
 
     logger.info(f"Embedded simulator started: {_sim_config['tps']} TPS, {_sim_config['fraud_rate']*100:.0f}% fraud")
     count = 0
+    url = f"http://127.0.0.1:{settings.BACKEND_PORT}/transactions"
+    send_slots = asyncio.Semaphore(_SIM_MAX_IN_FLIGHT)
+    in_flight: set[asyncio.Task] = set()
+
+    def generate(n: int) -> dict:
+        # Hero transaction every 25th
+        if n > 0 and n % 25 == 0:
+            return generate_hero_transaction()
+        if random.random() < _sim_config["fraud_rate"]:
+            # Filter to enabled fraud types
+            enabled = [ft for ft, on in _sim_config["fraud_types"].items() if on]
+            if enabled:
+                # Use original weights for enabled types
+                weights = [FRAUD_TYPES.get(ft, 0.2) for ft in enabled]
+                fraud_type = random.choices(enabled, weights=weights, k=1)[0]
+                generator = _FRAUD_GENERATORS.get(fraud_type)
+                if generator:
+                    return generator()
+        return generate_legit_transaction()
+
+    async def send(client: httpx.AsyncClient, txn: dict):
+        # SSE events are published by the POST /transactions endpoint
+        # itself, so the response body is not needed here.
+        try:
+            await client.post(url, json=txn)
+        except Exception as e:
+            logger.error(f"Simulator send failed: {e}")
+        finally:
+            send_slots.release()
 
-    async with httpx.AsyncClient() as client:
+    async with httpx.AsyncClient(limits=_SIM_LIMITS, timeout=_SIM_TIMEOUT) as client:
         while _sim_config["running"]:
             try:
-                # Hero transaction every 25th
-                if count > 0 and count % 25 == 0:
-                    txn = generate_hero_transaction()
-                    is_fraud = True
-                    fraud_type = "wash_trading"
-                else:
-                    is_fraud = random.random() < _sim_config["fraud_rate"]
-                    fraud_type = None
-
-                    if is_fraud:
-                        # Filter to enabled fraud types
-                        enabled = [
-                            ft for ft, enabled in _sim_config["fraud_types"].items()
-                            if enabled
-                        ]
-                        if enabled:
-                            # Use original weights for enabled types
-                            weights = [FRAUD_TYPES.get(ft, 0.2) for ft in enabled]
-                            fraud_type = random.choices(enabled, weights=weights, k=1)[0]
-                            generator = _FRAUD_GENERATORS.get(fraud_type)
-                            if generator:
-                                txn = generator()
-                            else:
-                                txn = generate_legit_transaction()
-                                is_fraud = False
-                        else:
-                            txn = generate_legit_transaction()
-                            is_fraud = False
-                    else:
-                        txn = generate_legit_transaction()
-
-                # Send to backend
-                resp = await client.post(
-                    f"http://127.0.0.1:{settings.BACKEND_PORT}/transactions",
-                    json=txn, timeout=5,
-                )
-                if resp.status_code == 200:
-                    # SSE events are now published by the POST /transactions
-                    # endpoint itself, so no duplicate publish needed here.
-                    pass
+                # Random generation is CPU work; keep it off the event loop
+                txn = await asyncio.to_thread(generate, count)
+
+                # Send to backend; only blocks when the in-flight cap is hit
+                await send_slots.acquire()
+                task = asyncio.create_task(send(client, txn))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
 
                 count += 1
                 await asyncio.sleep(1.0 / _sim_config["tps"])
@@ -1542,6 +1607,11 @@ async def _run_embedded_simulator():
                 logger.error(f"Simulator error: {e}")
                 await asyncio.sleep(1.0)
 
+        # Let POSTs already in flight finish (each is bounded by
+        # _SIM_TIMEOUT) before the client closes, so a stop doesn't drop
+        # transactions mid-submit
+        await asyncio.gather(*in_flight, return_exceptions=True)
+
     logger.info(f"Embedded simulator stopped after {count} transactions")
 
 
@@ -1580,7 +1650,7 @@ async def start_simulator(config: SimulatorConfig | None = None):
             "fraud_rate": _sim_config["fraud_rate"],
             "fraud_types": _sim_config["fraud_types"],
         },
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _now_iso(),
     })
 
     return {"status": "started", **_sim_config}
@@ -1605,7 +1675,7 @@ async def stop_simulator():
 
     _publish_event({
         "type": "simulator_stopped",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _now_iso(),
     })
 
     return {"status": "stopped"}
@@ -1626,7 +1696,7 @@ async def configure_simulator(config: SimulatorConfig):
             "fraud_rate": _sim_config["fraud_rate"],
             "fraud_types": _sim_config["fraud_types"],
         },
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _now_iso(),
     })
 
     return {"status": "configured", **_sim_config}
@@ -1640,10 +1710,10 @@ async def guardian_status():
 
     return {
         "running": _guardian_task is not None and not _guardian_task.done(),
-        "enabled": get_settings().GUARDIAN_ENABLED,
-        "check_interval": get_settings().GUARDIAN_CHECK_INTERVAL,
+        "enabled": settings.GUARDIAN_ENABLED,
+        "check_interval": settings.GUARDIAN_CHECK_INTERVAL,
         "consecutive_failures": guardian_failures,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _now_iso(),
     }
 
 
@@ -1651,7 +1721,7 @@ async def guardian_status():
 async def list_guardian_decisions(limit: int = Query(default=20, ge=1, le=100)):
     """List recent guardian agent decisions."""
     async with get_db() as db:
-        cursor = await db.execute(
+        rows = await db.execute_fetchall(
             """SELECT decision_id, timestamp, decision_type, reasoning,
                       context, outcome, model_version_before,
                       model_version_after, source
@@ -1659,14 +1729,13 @@ async def list_guardian_decisions(limit: int = Query(default=20, ge=1, le=100)):
                ORDER BY timestamp DESC LIMIT ?""",
             (limit,),
         )
-        rows = await cursor.fetchall()
 
     results = []
     for r in rows:
         ctx = {}
         if r[4]:
             try:
-                ctx = json.loads(r[4])
+                ctx = orjson.loads(r[4])
             except (json.JSONDecodeError, TypeError):
                 ctx = {"raw": r[4]}
         results.append({
@@ -1680,7 +1749,7 @@ async def list_guardian_decisions(limit: int = Query(default=20, ge=1, le=100)):
             "model_version_after": r[7],
             "source": r[8],
         })
-    return results
+    return ORJSONResponse(results)
 
 
 @app.post("/guardian/start")
@@ -1694,7 +1763,7 @@ async def start_guardian():
     _guardian_task = asyncio.create_task(
         run_guardian_loop(_publish_event, _do_retrain)
     )
-    return {"status": "started", "timestamp": datetime.utcnow().isoformat()}
+    return {"status": "started", "timestamp": _now_iso()}
 
 
 @app.post("/guardian/stop")
@@ -1712,7 +1781,7 @@ async def stop_guardian():
         pass
     _guardian_task = None
 
-    return {"status": "stopped", "timestamp": datetime.utcnow().isoformat()}
+    return {"status": "stopped", "timestamp": _now_iso()}
 
 
 # --- Demo Reset Endpoint ---
@@ -1793,7 +1862,7 @@ async def demo_reset():
         steps.append(f"bootstrap_{bootstrap_result}")
 
         # 8. Reload scorer and get new version
-        reload_model()
+        _reload_model()
         new_version = get_model_version()
         steps.append(f"scorer_reloaded_{new_version}")
 
@@ -1812,14 +1881,12 @@ async def demo_reset():
         try:
             metrics_files = sorted(MODEL_DIR.glob("metrics_v*.json"))
             if metrics_files:
-                metrics_data = json.loads(metrics_files[-1].read_text())
+                metrics_data = orjson.loads(metrics_files[-1].read_bytes())
                 async with get_db() as db:
                     await db.execute(
-                        """INSERT INTO metric_snapshots
-                           (snapshot_id, timestamp, model_version, metrics)
-                           VALUES (?, ?, ?, ?)""",
-                        (str(uuid4()), datetime.utcnow().isoformat(),
-                         new_version, json.dumps(metrics_data)),
+                        SNAPSHOT_INSERT_SQL,
+                        (str(uuid4()), _now_iso(),
+                         new_version, to_json(metrics_data)),
                     )
                     await db.commit()
                 steps.append("metrics_seeded")
@@ -1831,7 +1898,7 @@ async def demo_reset():
             "status": "reset_complete",
             "model_version": new_version,
             "steps": steps,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _now_iso(),
         }
 
 
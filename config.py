@@ -4,16 +4,37 @@ Uses pydantic-settings for validation and .env file support.
 All hardcoded values across the project should reference this module.
 """
 import os
-from functools import lru_cache
+from functools import cache
 from pathlib import Path
 
 # Project root directory
 PROJECT_ROOT = Path(__file__).parent
 
+# Values accepted as "on" for boolean flags (case-insensitive)
+_TRUTHY = frozenset({"1", "true", "yes", "on"})
+
+
+def _env_bool(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in _TRUTHY
+
 
 class Settings:
     """Application settings loaded from environment variables."""
 
+    # Fixed attribute set: slot reads skip the instance __dict__, and a
+    # mistyped assignment raises instead of silently adding a field.
+    __slots__ = (
+        "BACKEND_HOST", "BACKEND_PORT", "STREAMLIT_PORT",
+        "DATABASE_PATH", "DB_POOL_SIZE",
+        "OLLAMA_URL", "OLLAMA_MODEL", "OLLAMA_TIMEOUT",
+        "LLM_MULTI_AGENT", "LLM_MULTI_AGENT_ROLES", "MAX_CONCURRENT_EXPLAIN",
+        "SIMULATOR_TPS", "FRAUD_RATE",
+        "CORS_ORIGINS",
+        "LOG_LEVEL", "LOG_FORMAT",
+        "MODELS_DIR",
+        "GUARDIAN_ENABLED", "GUARDIAN_CHECK_INTERVAL", "GUARDIAN_MIN_LABELS",
+    )
+
     def __init__(self):
         # Server
         self.BACKEND_HOST: str = os.getenv("BACKEND_HOST", "127.0.0.1")
@@ -24,6 +45,7 @@ class Settings:
         self.DATABASE_PATH: str = os.getenv(
             "DATABASE_PATH", str(PROJECT_ROOT / "app.db")
         )
+        self.DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "8"))
 
         # Ollama LLM
         self.OLLAMA_URL: str = os.getenv(
@@ -31,13 +53,14 @@ class Settings:
         )
         self.OLLAMA_MODEL: str = os.getenv("OLLAMA_MODEL", "llama3.1:8b")
         self.OLLAMA_TIMEOUT: int = int(os.getenv("OLLAMA_TIMEOUT", "30"))
-        self.LLM_MULTI_AGENT: bool = os.getenv(
-            "LLM_MULTI_AGENT", "false"
-        ).lower() in ("1", "true", "yes", "on")
+        self.LLM_MULTI_AGENT: bool = _env_bool("LLM_MULTI_AGENT", "false")
         self.LLM_MULTI_AGENT_ROLES: list[str] = os.getenv(
             "LLM_MULTI_AGENT_ROLES",
             "behavioral,network,compliance",
         ).split(",")
+        self.MAX_CONCURRENT_EXPLAIN: int = int(
+            os.getenv("MAX_CONCURRENT_EXPLAIN", "5")
+        )
 
         # Simulator
         self.SIMULATOR_TPS: float = float(os.getenv("SIMULATOR_TPS", "1.0"))
@@ -58,9 +81,7 @@ class Settings:
         )
 
         # Guardian Agent
-        self.GUARDIAN_ENABLED: bool = os.getenv(
-            "GUARDIAN_ENABLED", "true"
-        ).lower() in ("1", "true", "yes", "on")
+        self.GUARDIAN_ENABLED: bool = _env_bool("GUARDIAN_ENABLED", "true")
         self.GUARDIAN_CHECK_INTERVAL: int = int(
             os.getenv("GUARDIAN_CHECK_INTERVAL", "30")
         )
@@ -73,7 +94,7 @@ class Settings:
         return f"http://{self.BACKEND_HOST}:{self.BACKEND_PORT}"
 
 
-@lru_cache()
+@cache
 def get_settings() -> Settings:
     """Get cached settings instance."""
     return Settings()
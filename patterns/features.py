@@ -9,18 +9,28 @@ member_ids stored in each pattern card's detection_rule.
 Pattern type classification uses detection_rule["type"] instead
 of parsing description text.
 """
-import json
+import orjson
 
-# Module-level cache for pattern lookup.
-# Refreshed each time compute_pattern_features is called with fresh DB data.
+# Process-wide inverted index of the active pattern cards, tagged with the
+# pattern_cards version counter it was built from (bumped by triggers on
+# every pattern_cards write, see backend/db.py). Scoring reuses it until
+# the version moves.
 _pattern_cache: dict[str, list[dict]] | None = None
-_pattern_cache_version: int = 0
+_pattern_cache_version: int | None = None
+
+_ACTIVE_PATTERNS_SQL = """
+    SELECT pattern_type, detection_rule, stats, confidence
+    FROM pattern_cards
+    WHERE status = 'active'"""
+_VERSION_SQL = "SELECT value FROM counters WHERE name = 'pattern_cards_version'"
 
 
 def _build_inverted_index(rows: list[tuple]) -> dict[str, list[dict]]:
     """Build inverted index: {entity_id: [pattern_card_dicts]}.
 
-    Each pattern_card_dict contains: pattern_type, rule_type, stats, confidence.
+    Each pattern_card_dict contains: pattern_type, rule_type, stats, confidence,
+    hub_degree and signal. The parsed detection_rule is not kept, so the
+    cached index holds each entity ID once, as its dict key.
     """
     index: dict[str, list[dict]] = {}
 
@@ -29,31 +39,91 @@ def _build_inverted_index(rows: list[tuple]) -> dict[str, list[dict]]:
         stats = {}
         if detection_rule_json:
             try:
-                rule = json.loads(detection_rule_json)
-            except (json.JSONDecodeError, TypeError):
+                rule = orjson.loads(detection_rule_json)
+            except (orjson.JSONDecodeError, TypeError):
                 pass
         if stats_json:
             try:
-                stats = json.loads(stats_json)
-            except (json.JSONDecodeError, TypeError):
+                stats = orjson.loads(stats_json)
+            except (orjson.JSONDecodeError, TypeError):
                 pass
 
         member_ids = rule.get("member_ids", [])
         rule_type = rule.get("type", "")
 
+        # Normalized hub degree, computed once per card rather than per lookup
+        degree = stats.get("out_degree") or stats.get("in_degree") or 0
         card_info = {
             "pattern_type": pattern_type,
             "rule_type": rule_type,
             "stats": stats,
             "confidence": confidence or 0.0,
-            "rule": rule,
+            "hub_degree": min(degree / 20.0, 1.0),
         }
+        # Feature value the card contributes: its hub degree for hubs, 1.0
+        # for membership patterns
+        card_info["signal"] = (
+            card_info["hub_degree"] if rule_type in ("hub_out", "hub_in") else 1.0
+        )
 
         for entity_id in member_ids:
-            if entity_id not in index:
-                index[entity_id] = []
-            index[entity_id].append(card_info)
+            index.setdefault(entity_id, []).append(card_info)
+
+    return index
+
 
+# All-zero feature set; copied per call (one C-level copy, no literal rebuild)
+_ZERO_FEATURES: dict[str, float] = {
+    "sender_in_ring": 0.0,
+    "sender_is_hub": 0.0,
+    "sender_in_velocity_cluster": 0.0,
+    "sender_in_dense_cluster": 0.0,
+    "receiver_in_ring": 0.0,
+    "receiver_is_hub": 0.0,
+    "pattern_count_sender": 0.0,
+}
+
+# rule_type -> the feature a card of that type sets, per side of the pair.
+# Receivers only carry ring / hub features.
+_SENDER_FEATURES = {
+    "cycle": "sender_in_ring",
+    "hub_out": "sender_is_hub",
+    "hub_in": "sender_is_hub",
+    "velocity": "sender_in_velocity_cluster",
+    "dense_subgraph": "sender_in_dense_cluster",
+}
+_RECEIVER_FEATURES = {
+    "cycle": "receiver_in_ring",
+    "hub_out": "receiver_is_hub",
+    "hub_in": "receiver_is_hub",
+}
+
+
+def _apply_cards(result: dict, cards, features: dict[str, str]) -> None:
+    """Raise each card's feature in `result` to the card's signal (max wins)."""
+    for card in cards:
+        name = features.get(card["rule_type"])
+        if name is not None and card["signal"] > result[name]:
+            result[name] = card["signal"]
+
+
+async def get_pattern_index(db, version: int | None = None) -> dict[str, list[dict]]:
+    """Inverted index of the active pattern cards, rebuilt only when they change.
+
+    `version` is the current pattern_cards version counter; callers that
+    already selected it alongside other data pass it in to skip the lookup.
+    The counter is read before the cards, so an index is never tagged with
+    a version newer than its rows.
+    """
+    global _pattern_cache, _pattern_cache_version
+    if version is None:
+        rows = await db.execute_fetchall(_VERSION_SQL)
+        version = rows[0][0] if rows else None
+    if _pattern_cache is not None and version is not None and version == _pattern_cache_version:
+        return _pattern_cache
+
+    index = _build_inverted_index(await db.execute_fetchall(_ACTIVE_PATTERNS_SQL))
+    _pattern_cache, _pattern_cache_version = index, version
     return index
 
 
@@ -69,60 +139,24 @@ async def compute_pattern_features(db, sender_id: str, receiver_id: str) -> dict
     - receiver_is_hub: same for receiver
     - pattern_count_sender: number of distinct patterns involving sender, normalized
     """
-    result = {
-        "sender_in_ring": 0.0,
-        "sender_is_hub": 0.0,
-        "sender_in_velocity_cluster": 0.0,
-        "sender_in_dense_cluster": 0.0,
-        "receiver_in_ring": 0.0,
-        "receiver_is_hub": 0.0,
-        "pattern_count_sender": 0.0,
-    }
-
-    cursor = await db.execute(
-        """SELECT pattern_type, detection_rule, stats, confidence
-           FROM pattern_cards
-           WHERE status = 'active'"""
-    )
-    rows = await cursor.fetchall()
-
-    if not rows:
-        return result
+    index = await get_pattern_index(db)
+    return pattern_features_from_index(index, sender_id, receiver_id)
 
-    # Build inverted index from member_ids
-    index = _build_inverted_index(rows)
+
+def pattern_features_from_index(index: dict[str, list[dict]], sender_id: str, receiver_id: str) -> dict:
+    """Compute the pattern features for a pair from a built inverted index."""
+    result = _ZERO_FEATURES.copy()
 
     # Lookup sender's patterns via inverted index — O(1) per entity
-    sender_cards = index.get(sender_id, [])
-    receiver_cards = index.get(receiver_id, [])
+    sender_cards = index.get(sender_id, ())
+    receiver_cards = index.get(receiver_id, ())
+    if not sender_cards and not receiver_cards:
+        return result
 
     sender_pattern_count = len(sender_cards)
 
-    for card in sender_cards:
-        rule_type = card["rule_type"]
-        stats = card["stats"]
-
-        if rule_type == "cycle":
-            result["sender_in_ring"] = 1.0
-        elif rule_type in ("hub_out", "hub_in"):
-            degree = stats.get("out_degree") or stats.get("in_degree") or 0
-            normalized_degree = min(degree / 20.0, 1.0)
-            result["sender_is_hub"] = max(result["sender_is_hub"], normalized_degree)
-        elif rule_type == "velocity":
-            result["sender_in_velocity_cluster"] = 1.0
-        elif rule_type == "dense_subgraph":
-            result["sender_in_dense_cluster"] = 1.0
-
-    for card in receiver_cards:
-        rule_type = card["rule_type"]
-        stats = card["stats"]
-
-        if rule_type == "cycle":
-            result["receiver_in_ring"] = 1.0
-        elif rule_type in ("hub_out", "hub_in"):
-            degree = stats.get("out_degree") or stats.get("in_degree") or 0
-            normalized_degree = min(degree / 20.0, 1.0)
-            result["receiver_is_hub"] = max(result["receiver_is_hub"], normalized_degree)
+    _apply_cards(result, sender_cards, _SENDER_FEATURES)
+    _apply_cards(result, receiver_cards, _RECEIVER_FEATURES)
 
     # Normalize pattern count (cap at 5 patterns)
     result["pattern_count_sender"] = min(sender_pattern_count / 5.0, 1.0)
@@ -3,24 +3,31 @@
 Builds sender-receiver transaction graphs and discovers:
 1. Fraud rings (SCC-based cycle detection for wash trading)
 2. Hub accounts (HITS algorithm + z-score on degree distribution)
-3. Velocity clusters (sliding window two-pointer)
+3. Velocity clusters (vectorized sliding window)
 4. Dense subgraphs (SCC + flow-weighted directed density)
 """
 import hashlib
 import json
 import math
-from collections import defaultdict
+import time
+import warnings
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from uuid import uuid4
 
 import logging
 
 import networkx as nx
 import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.sparse.linalg import ArpackNoConvergence, svds
 
 logger = logging.getLogger(__name__)
 
+# Compact JSON for stored columns — smaller rows, more rows per page
+_JSON_SEPARATORS = (",", ":")
+
 
 @dataclass
 class PatternCard:
@@ -37,13 +44,25 @@ class PatternCard:
     related_txn_ids: list[str] | None = None
 
 
+@dataclass
+class SCCInfo:
+    """A strongly connected component with aggregates over its internal edges."""
+    members: frozenset
+    total_flow: float
+    edge_count: int
+    txn_ids: list[str]
+
+
 def build_transaction_graph(transactions: list[dict]) -> nx.DiGraph:
     """Build a directed graph from transactions.
 
     Nodes = user IDs (senders and receivers)
     Edges = transactions between them, with weight = total amount
     """
-    G = nx.DiGraph()
+    # Aggregate per (sender, receiver) in a plain dict first, then add every
+    # edge in one add_edges_from call; per-transaction has_edge / add_edge
+    # would pay networkx's bookkeeping for each repeated pair.
+    edges: dict[tuple[str, str], dict] = {}
 
     for txn in transactions:
         sender = txn.get("sender_id", "")
@@ -54,67 +73,116 @@ def build_transaction_graph(transactions: list[dict]) -> nx.DiGraph:
         if not sender or not receiver:
             continue
 
-        if G.has_edge(sender, receiver):
-            G[sender][receiver]["weight"] += amount
-            G[sender][receiver]["count"] += 1
-            G[sender][receiver]["txn_ids"].append(txn_id)
+        attrs = edges.get((sender, receiver))
+        if attrs is None:
+            edges[(sender, receiver)] = {"weight": amount, "count": 1, "txn_ids": [txn_id]}
         else:
-            G.add_edge(sender, receiver, weight=amount, count=1, txn_ids=[txn_id])
+            attrs["weight"] += amount
+            attrs["count"] += 1
+            attrs["txn_ids"].append(txn_id)
 
+    G = nx.DiGraph()
+    G.add_edges_from((u, v, attrs) for (u, v), attrs in edges.items())
     return G
 
 
-def detect_rings(G: nx.DiGraph, min_size: int = 3, max_size: int = 20) -> list[PatternCard]:
+def strongly_connected_components(G: nx.DiGraph) -> list[frozenset]:
+    """Strongly connected components of G, as frozensets of node IDs.
+
+    Same components as nx.strongly_connected_components, but computed by
+    scipy's compiled Tarjan on a CSR adjacency matrix instead of networkx's
+    pure-Python traversal.
+    """
+    nodes = list(G)
+    if not nodes:
+        return []
+    index = {node: i for i, node in enumerate(nodes)}
+    m = G.number_of_edges()
+    rows = np.fromiter((index[u] for u, _ in G.edges()), dtype=np.int32, count=m)
+    cols = np.fromiter((index[v] for _, v in G.edges()), dtype=np.int32, count=m)
+    adjacency = csr_matrix((np.ones(m, dtype=np.int8), (rows, cols)), shape=(len(nodes), len(nodes)))
+    n_components, labels = connected_components(adjacency, directed=True, connection="strong")
+
+    # Each component becomes a frozenset exactly once; callers test
+    # membership against it and hand it to G.subgraph as is
+    members: list[list] = [[] for _ in range(n_components)]
+    for node, label in zip(nodes, labels.tolist()):
+        members[label].append(node)
+    return [frozenset(component) for component in members]
+
+
+def scc_infos(G: nx.DiGraph, min_size: int = 3) -> list[SCCInfo]:
+    """SCCs of at least min_size members, each with its flow aggregated in one edge pass.
+
+    Shared by detect_rings and detect_dense_subgraphs so neither walks the
+    component's edges again.
+    """
+    infos = []
+    succ = G.succ
+    for scc in strongly_connected_components(G):
+        if len(scc) < min_size:
+            continue
+        total_flow = 0.0
+        edge_count = 0
+        txn_ids: list[str] = []
+        for u in sorted(scc):
+            for v, data in succ[u].items():
+                if v in scc:
+                    total_flow += data.get("weight", 0)
+                    edge_count += 1
+                    txn_ids.extend(data.get("txn_ids", []))
+        infos.append(SCCInfo(scc, total_flow, edge_count, txn_ids))
+    return infos
+
+
+def detect_rings(G: nx.DiGraph, min_size: int = 3, max_size: int = 20,
+                 sccs: list[SCCInfo] | None = None) -> list[PatternCard]:
     """Detect circular fund flows (fraud rings / wash trading).
 
     Uses Tarjan's SCC algorithm to find strongly connected components,
     then extracts representative cycles from each SCC subgraph.
     SCCs of size >= min_size and <= max_size are ring candidates.
     Confidence is inverted: shorter cycles = higher confidence.
-    Ranked by total edge weight (flow).
+    Ranked by total edge weight (flow). `sccs` takes a precomputed
+    scc_infos(G) result to share with other detectors.
     """
     patterns = []
 
     # Use Tarjan's SCC — O(V+E) — to find ring candidates
-    sccs = []
-    for scc in nx.strongly_connected_components(G):
-        if len(scc) < min_size:
+    candidates = []
+    for info in scc_infos(G, min_size) if sccs is None else sccs:
+        if len(info.members) < min_size:
             continue
-        if len(scc) > max_size:
-            logger.info("SCC of %d members filtered by max_size=%d in detect_rings", len(scc), max_size)
+        if len(info.members) > max_size:
+            logger.info("SCC of %d members filtered by max_size=%d in detect_rings", len(info.members), max_size)
             continue
-        sccs.append(scc)
+        candidates.append(info)
 
-    if not sccs:
+    if not candidates:
         return patterns
 
     # Rank SCCs by total flow weight
-    scc_data = []
-    for scc in sccs:
-        subgraph = G.subgraph(scc)
-        total_flow = sum(d.get("weight", 0) for _, _, d in subgraph.edges(data=True))
-        scc_data.append((scc, subgraph, total_flow))
-
-    scc_data.sort(key=lambda x: -x[2])
+    candidates.sort(key=lambda info: -info.total_flow)
 
-    for scc, subgraph, total_flow in scc_data[:5]:
+    for info in candidates[:5]:
+        scc, total_flow, txn_ids = info.members, info.total_flow, info.txn_ids
+        subgraph = G.subgraph(scc)
         member_ids = sorted(scc)
 
         # Extract one representative cycle from the SCC subgraph (bounded)
         representative_cycle = None
+        # Self-transfers are 1-cycles that can never qualify; hide them from
+        # the cycle search (a view, no copy) so it doesn't enumerate them first
+        self_loops = list(nx.selfloop_edges(subgraph))
+        cycle_graph = nx.restricted_view(subgraph, [], self_loops) if self_loops else subgraph
         try:
-            for cycle in nx.simple_cycles(subgraph, length_bound=min(len(scc), 6)):
+            for cycle in nx.simple_cycles(cycle_graph, length_bound=min(len(scc), 6)):
                 if len(cycle) >= min_size:
                     representative_cycle = cycle
                     break
         except Exception:
             pass
 
-        # Collect all txn_ids within the SCC
-        txn_ids = []
-        for u, v, data in subgraph.edges(data=True):
-            txn_ids.extend(data.get("txn_ids", []))
-
         cycle_len = len(representative_cycle) if representative_cycle else len(scc)
         # Inverted confidence: shorter cycles = higher confidence
         confidence = min(0.95 - (cycle_len - min_size) * 0.1, 0.95)
@@ -159,39 +227,58 @@ def detect_hubs(G: nx.DiGraph, threshold: int = 5) -> list[PatternCard]:
     if G.number_of_nodes() < 2:
         return patterns
 
-    # Compute HITS hub and authority scores — textbook algorithm for this problem
-    try:
-        hubs, authorities = nx.hits(G, max_iter=100, tol=1e-6)
-    except nx.PowerIterationFailedConvergence:
-        hubs = {n: 0.0 for n in G.nodes()}
-        authorities = {n: 0.0 for n in G.nodes()}
-
-    # Compute weighted out-degree (strength) and z-scores for adaptive thresholding
-    out_strengths = {}
-    in_strengths = {}
-    for node in G.nodes():
-        out_strengths[node] = sum(d.get("weight", 0) for _, _, d in G.out_edges(node, data=True))
-        in_strengths[node] = sum(d.get("weight", 0) for _, _, d in G.in_edges(node, data=True))
-
-    out_degrees = np.array([G.out_degree(n) for n in G.nodes()])
-    in_degrees = np.array([G.in_degree(n) for n in G.nodes()])
+    # Degrees and weighted degrees (strength) for adaptive thresholding, from
+    # one pass over the edges: bincount over integer node indices instead of
+    # walking each node's in/out edges.
     nodes_list = list(G.nodes())
+    node_idx = {n: i for i, n in enumerate(nodes_list)}
+    n_nodes, n_edges = len(nodes_list), G.number_of_edges()
+    src = np.empty(n_edges, dtype=np.intp)
+    dst = np.empty(n_edges, dtype=np.intp)
+    weights = np.empty(n_edges, dtype=np.float64)
+    for i, (u, v, d) in enumerate(G.edges(data=True)):
+        src[i] = node_idx[u]
+        dst[i] = node_idx[v]
+        weights[i] = d.get("weight", 0)
+
+    out_degrees = np.bincount(src, minlength=n_nodes)
+    in_degrees = np.bincount(dst, minlength=n_nodes)
+    out_strengths = np.bincount(src, weights=weights, minlength=n_nodes)
+    in_strengths = np.bincount(dst, weights=weights, minlength=n_nodes)
+
+    # HITS hub/authority scores are the top left/right singular vectors of the
+    # weighted adjacency matrix (what nx.hits computes); building the CSR from
+    # the edge arrays above skips networkx's dict-of-dicts conversion.
+    hub_vec = np.zeros(n_nodes)
+    auth_vec = np.zeros(n_nodes)
+    if n_edges:
+        adjacency = csr_matrix((weights, (src, dst)), shape=(n_nodes, n_nodes))
+        try:
+            u, _, vt = svds(adjacency, k=1, maxiter=100, tol=1e-6)
+            hub_vec = np.abs(u[:, 0])
+            auth_vec = np.abs(vt[0])
+            hub_vec /= hub_vec.sum()
+            auth_vec /= auth_vec.sum()
+        except ArpackNoConvergence:
+            hub_vec = np.zeros(n_nodes)
+            auth_vec = np.zeros(n_nodes)
+    hubs = dict(zip(nodes_list, hub_vec.tolist()))
+    authorities = dict(zip(nodes_list, auth_vec.tolist()))
 
     # Z-score thresholding: flag outliers > mean + 2*std
-    def get_outliers(degrees, direction):
-        if len(degrees) < 2 or np.std(degrees) == 0:
+    def get_outliers(degrees):
+        if len(degrees) < 2:
+            return []
+        std_d = degrees.std()
+        if std_d == 0:
             return []
-        mean_d = np.mean(degrees)
-        std_d = np.std(degrees)
-        z_threshold = mean_d + 2 * std_d
-        return [
-            (nodes_list[i], int(degrees[i]))
-            for i in range(len(degrees))
-            if degrees[i] >= z_threshold and degrees[i] >= 2  # minimum sanity
-        ]
+        z_threshold = degrees.mean() + 2 * std_d
+        # minimum sanity: a hub needs at least 2 counterparties
+        idxs = np.flatnonzero((degrees >= z_threshold) & (degrees >= 2))
+        return [(nodes_list[i], int(degrees[i])) for i in idxs]
 
     # Out-degree hubs (senders to many receivers)
-    out_hub_candidates = get_outliers(out_degrees, "out")
+    out_hub_candidates = get_outliers(out_degrees)
     # Sort by HITS hub score descending
     out_hub_candidates.sort(key=lambda x: -hubs.get(x[0], 0))
 
@@ -228,13 +315,13 @@ def detect_hubs(G: nx.DiGraph, threshold: int = 5) -> list[PatternCard]:
             },
             stats={"out_degree": degree, "total_amount": round(total_amount, 2),
                    "hub_score": round(hub_score, 6),
-                   "weighted_degree": round(out_strengths.get(node, 0), 2),
+                   "weighted_degree": round(float(out_strengths[node_idx[node]]), 2),
                    "receivers_sample": receivers[:5]},
             related_txn_ids=txn_ids[:20],
         ))
 
     # In-degree hubs (receivers from many senders)
-    in_hub_candidates = get_outliers(in_degrees, "in")
+    in_hub_candidates = get_outliers(in_degrees)
     # Sort by HITS authority score descending
     in_hub_candidates.sort(key=lambda x: -authorities.get(x[0], 0))
 
@@ -270,7 +357,7 @@ def detect_hubs(G: nx.DiGraph, threshold: int = 5) -> list[PatternCard]:
             },
             stats={"in_degree": degree, "total_amount": round(total_amount, 2),
                    "authority_score": round(auth_score, 6),
-                   "weighted_degree": round(in_strengths.get(node, 0), 2),
+                   "weighted_degree": round(float(in_strengths[node_idx[node]]), 2),
                    "senders_sample": senders[:5]},
             related_txn_ids=txn_ids[:20],
         ))
@@ -278,6 +365,55 @@ def detect_hubs(G: nx.DiGraph, threshold: int = 5) -> list[PatternCard]:
     return patterns
 
 
+def _epoch_seconds(timestamps: list[str]) -> np.ndarray:
+    """Parse ISO timestamps to float epoch seconds, NaN where missing or invalid.
+
+    The common case (naive or 'Z'-suffixed strings) is parsed in one
+    datetime64 conversion; a batch numpy rejects (offsets, a malformed
+    entry) falls back to datetime.fromisoformat per string.
+    """
+    try:
+        with warnings.catch_warnings():
+            # numpy only warns on timezone offsets; treat that as a rejection
+            warnings.simplefilter("error")
+            parsed = np.array([ts[:-1] if ts.endswith("Z") else (ts or "NaT") for ts in timestamps],
+                              dtype="datetime64[us]")
+        epoch = parsed.astype(np.int64) / 1_000_000.0
+        epoch[np.isnat(parsed)] = np.nan
+        return epoch
+    except (ValueError, TypeError, AttributeError, Warning):
+        pass
+
+    epoch = np.full(len(timestamps), np.nan)
+    for i, ts in enumerate(timestamps):
+        if not ts:
+            continue
+        try:
+            dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+        except (ValueError, TypeError, AttributeError):
+            continue
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        epoch[i] = dt.timestamp()
+    return epoch
+
+
+def _densest_window(timestamps: np.ndarray, window_seconds: float) -> tuple[int, int]:
+    """Largest number of sorted timestamps within any window_seconds span.
+
+    Vectorized two-pointer: for every right edge, searchsorted finds the first
+    timestamp still inside the window. Returns (count, start index) of the
+    earliest densest window.
+    """
+    if timestamps.size == 0:
+        return 0, 0
+    right = np.arange(timestamps.size)
+    left = np.searchsorted(timestamps, timestamps - window_seconds, side="left")
+    counts = right - left + 1
+    best = int(counts.argmax())
+    return int(counts[best]), int(left[best])
+
+
 def detect_velocity_clusters(transactions: list[dict], window_minutes: int = 60,
                               threshold: int = 5) -> list[PatternCard]:
     """Detect temporal velocity anomalies — bursts of transactions from same sender.
@@ -288,53 +424,45 @@ def detect_velocity_clusters(transactions: list[dict], window_minutes: int = 60,
     """
     patterns = []
 
-    # Group transactions by sender
-    by_sender: dict[str, list[dict]] = defaultdict(list)
-    for txn in transactions:
-        sender = txn.get("sender_id", "")
-        if sender:
-            by_sender[sender].append(txn)
+    # Parse every timestamp once, in bulk; NaN marks missing/unparseable ones
+    epoch = _epoch_seconds([t.get("timestamp", "") for t in transactions])
 
-    window_seconds = window_minutes * 60
+    # Factorize senders (first-seen integer codes via one dict pass) and count
+    # per code, so only senders that can reach the threshold get sorted.
+    # Code 0 is reserved for a missing sender.
+    sender_codes: dict[str, int] = {"": 0}
+    codes = np.fromiter(
+        (sender_codes.setdefault(t.get("sender_id") or "", len(sender_codes)) for t in transactions),
+        dtype=np.intp, count=len(transactions),
+    )
+    names = list(sender_codes)
+    totals = np.bincount(codes, minlength=len(names))
+    keep = np.flatnonzero(~np.isnan(epoch) & (codes != 0))
+    parsed_counts = np.bincount(codes[keep], minlength=len(names))
+    keep = keep[parsed_counts[codes[keep]] >= threshold]
+    if keep.size == 0:
+        return patterns
 
-    for sender, txns in by_sender.items():
-        if len(txns) < threshold:
-            continue
+    # One global sort by (sender, time) instead of a sort per sender
+    order = keep[np.lexsort((epoch[keep], codes[keep]))]
+    bounds = np.flatnonzero(np.diff(codes[order])) + 1
+    starts = np.concatenate(([0], bounds))
+    ends = np.concatenate((bounds, [order.size]))
 
-        # Sort by timestamp and parse to epoch seconds
-        sorted_txns = sorted(txns, key=lambda t: t.get("timestamp", ""))
-        timestamps = []
-        for t in sorted_txns:
-            ts_str = t.get("timestamp", "")
-            if not ts_str:
-                continue
-            try:
-                dt = datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
-                timestamps.append(dt.timestamp())
-            except (ValueError, TypeError):
-                continue
+    window_seconds = window_minutes * 60
 
-        if len(timestamps) < threshold:
-            continue
+    for group_start, group_end in zip(starts.tolist(), ends.tolist()):
+        code = codes[order[group_start]]
+        sender = names[code]
+        idx = order[group_start:group_end]
 
-        # Sliding window two-pointer to find max count in any window
-        max_count = 0
-        max_window_start = 0
-        left = 0
-        for right in range(len(timestamps)):
-            # Shrink window from left while it exceeds window_seconds
-            while timestamps[right] - timestamps[left] > window_seconds:
-                left += 1
-            window_count = right - left + 1
-            if window_count > max_count:
-                max_count = window_count
-                max_window_start = left
+        max_count, max_window_start = _densest_window(epoch[idx], window_seconds)
 
         if max_count < threshold:
             continue
 
         # Collect txn_ids from the densest window
-        window_txns = sorted_txns[max_window_start:max_window_start + max_count]
+        window_txns = [transactions[i] for i in idx[max_window_start:max_window_start + max_count]]
         txn_ids = [t.get("txn_id", "") for t in window_txns]
         total_amount = sum(t.get("amount", 0) for t in window_txns)
         avg_amount = total_amount / max_count if max_count else 0
@@ -360,7 +488,7 @@ def detect_velocity_clusters(transactions: list[dict], window_minutes: int = 60,
             },
             stats={"txn_count": max_count, "total_amount": round(total_amount, 2),
                    "avg_amount": round(avg_amount, 2),
-                   "total_sender_txns": len(txns)},
+                   "total_sender_txns": int(totals[code])},
             related_txn_ids=txn_ids[:20],
         ))
 
@@ -369,34 +497,33 @@ def detect_velocity_clusters(transactions: list[dict], window_minutes: int = 60,
     return patterns[:5]
 
 
-def detect_dense_subgraphs(G: nx.DiGraph, min_density: float = 0.5, max_size: int = 20) -> list[PatternCard]:
+def detect_dense_subgraphs(G: nx.DiGraph, min_density: float = 0.5, max_size: int = 20,
+                           sccs: list[SCCInfo] | None = None) -> list[PatternCard]:
     """Detect dense subgraphs that may indicate coordinated fraud.
 
     Uses Tarjan's SCC to preserve directionality (not converting to undirected).
     Computes directed density within each SCC.
-    Ranks by density * log(total_flow + 1).
+    Ranks by density * log(total_flow + 1). `sccs` is an optional
+    precomputed scc_infos(G) result.
     """
     patterns = []
 
-    for scc in nx.strongly_connected_components(G):
+    for info in scc_infos(G) if sccs is None else sccs:
+        scc = info.members
         if len(scc) < 3:
             continue
         if len(scc) > max_size:
             logger.info("SCC of %d members filtered by max_size=%d in detect_dense_subgraphs", len(scc), max_size)
             continue
 
-        subgraph = G.subgraph(scc)
-        density = nx.density(subgraph)
+        # Directed density, as nx.density computes it
+        density = info.edge_count / (len(scc) * (len(scc) - 1))
 
         if density < min_density:
             continue
 
-        # Collect all transaction IDs and total flow in this SCC
-        txn_ids = []
-        total_amount = 0
-        for u, v, data in subgraph.edges(data=True):
-            txn_ids.extend(data.get("txn_ids", []))
-            total_amount += data.get("weight", 0)
+        txn_ids = info.txn_ids
+        total_amount = info.total_flow
 
         member_ids = sorted(scc)
         members_str = [n[:12] for n in member_ids[:8]]
@@ -421,7 +548,7 @@ def detect_dense_subgraphs(G: nx.DiGraph, min_density: float = 0.5, max_size: in
             },
             stats={"members": len(scc), "density": round(density, 4),
                    "total_amount": round(total_amount, 2),
-                   "edge_count": subgraph.number_of_edges(),
+                   "edge_count": info.edge_count,
                    "rank_score": round(rank_score, 4)},
             related_txn_ids=txn_ids[:20],
         ))
@@ -429,6 +556,12 @@ def detect_dense_subgraphs(G: nx.DiGraph, min_density: float = 0.5, max_size: in
     return sorted(patterns, key=lambda p: p.stats.get("rank_score", 0) if p.stats else 0, reverse=True)[:5]
 
 
+def _member_signature(member_ids) -> str:
+    # A dedup key, not a security boundary: 64-bit BLAKE2b over the sorted,
+    # NUL-joined IDs (same 16 hex chars as the old truncated SHA-256)
+    return hashlib.blake2b("\x00".join(sorted(member_ids)).encode(), digest_size=8).hexdigest()
+
+
 def _structural_signature(pattern: PatternCard) -> str:
     """Compute a structural dedup key from sorted member_ids."""
     member_ids = []
@@ -436,8 +569,19 @@ def _structural_signature(pattern: PatternCard) -> str:
         member_ids = pattern.detection_rule.get("member_ids", [])
     if not member_ids:
         return pattern.pattern_id  # unique fallback
-    key = tuple(sorted(member_ids))
-    return hashlib.sha256(str(key).encode()).hexdigest()[:16]
+    return _member_signature(member_ids)
+
+
+def _stored_signature(name: str, rule_json: str | None) -> str:
+    """Signature for a stored card; legacy cards without member_ids dedup by name."""
+    if rule_json:
+        try:
+            member_ids = json.loads(rule_json).get("member_ids", [])
+            if member_ids:
+                return _member_signature(member_ids)
+        except (json.JSONDecodeError, TypeError, AttributeError):
+            pass
+    return name
 
 
 def _infer_fraud_typology(pattern: PatternCard) -> tuple[str, str]:
@@ -485,9 +629,12 @@ def mine_patterns(transactions: list[dict]) -> list[PatternCard]:
 
     # Build graph
     G = build_transaction_graph(transactions)
+    # One SCC decomposition (with per-SCC flow aggregates) shared by the ring
+    # and dense-subgraph detectors; neither looks at components smaller than 3
+    sccs = scc_infos(G, min_size=3)
 
     # 1. Detect circular flows (rings / wash trading)
-    ring_patterns = detect_rings(G)
+    ring_patterns = detect_rings(G, sccs=sccs)
     patterns.extend(ring_patterns)
 
     # 2. Detect hub accounts
@@ -499,7 +646,7 @@ def mine_patterns(transactions: list[dict]) -> list[PatternCard]:
     patterns.extend(velocity_patterns)
 
     # 4. Detect dense subgraphs
-    dense_patterns = detect_dense_subgraphs(G, min_density=0.5)
+    dense_patterns = detect_dense_subgraphs(G, min_density=0.5, sccs=sccs)
     patterns.extend(dense_patterns)
 
     return patterns
@@ -560,8 +707,10 @@ async def run_mining_job_async(db) -> list[PatternCard]:
                 continue
         if to_delete:
             logger.info("Cleaning up %d oversized SCC pattern cards (Python fallback)", len(to_delete))
-            for pid in to_delete[:100]:
-                await db.execute("DELETE FROM pattern_cards WHERE pattern_id = ?", (pid,))
+            await db.executemany(
+                "DELETE FROM pattern_cards WHERE pattern_id = ?",
+                [(pid,) for pid in to_delete[:100]],
+            )
             await db.commit()
 
     # Fetch recent transactions
@@ -584,29 +733,26 @@ async def run_mining_job_async(db) -> list[PatternCard]:
     # Mine patterns
     patterns = mine_patterns(transactions)
 
-    # Build existing structural signatures for dedup
-    existing_cursor = await db.execute(
-        "SELECT name, detection_rule FROM pattern_cards WHERE status = 'active'"
+    # Existing structural signatures for dedup, read from the stored column.
+    # Rows written before the column existed (or inserted without it) get
+    # theirs computed and saved once here.
+    legacy_rows = await db.execute_fetchall(
+        "SELECT pattern_id, name, detection_rule FROM pattern_cards WHERE structural_sig IS NULL"
     )
-    existing_rows = await existing_cursor.fetchall()
-
-    existing_signatures = set()
-    for name, rule_json in existing_rows:
-        if rule_json:
-            try:
-                rule = json.loads(rule_json)
-                member_ids = rule.get("member_ids", [])
-                if member_ids:
-                    key = tuple(sorted(member_ids))
-                    sig = hashlib.sha256(str(key).encode()).hexdigest()[:16]
-                    existing_signatures.add(sig)
-                    continue
-            except (json.JSONDecodeError, TypeError):
-                pass
-        # Fallback: use name for legacy patterns without member_ids
-        existing_signatures.add(name)
+    if legacy_rows:
+        await db.executemany(
+            "UPDATE pattern_cards SET structural_sig = ? WHERE pattern_id = ?",
+            [(_stored_signature(name, rule_json), pid) for pid, name, rule_json in legacy_rows],
+        )
+    existing_signatures = {
+        sig for (sig,) in await db.execute_fetchall(
+            "SELECT structural_sig FROM pattern_cards WHERE status = 'active'"
+        )
+    }
 
-    new_count = 0
+    new_rows = []
+    match_rows = []
+    matched_at = int(time.time())
     for pattern in patterns:
         sig = _structural_signature(pattern)
         if sig not in existing_signatures:
@@ -617,19 +763,34 @@ async def run_mining_job_async(db) -> list[PatternCard]:
                 pattern.detection_rule["fraud_typology"] = typology_code
             if typology_label not in ("Unclassified",) and typology_label not in pattern.name:
                 pattern.name = f"[{typology_label}] {pattern.name}"
-            await db.execute(
-                """INSERT INTO pattern_cards
-                   (pattern_id, name, description, discovered_at, status, pattern_type,
-                    confidence, detection_rule, stats, related_txn_ids)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            new_rows.append(
                 (pattern.pattern_id, pattern.name, pattern.description,
                  pattern.discovered_at, pattern.status, pattern.pattern_type,
                  pattern.confidence,
-                 json.dumps(pattern.detection_rule) if pattern.detection_rule else None,
-                 json.dumps(pattern.stats) if pattern.stats else None,
-                 json.dumps(pattern.related_txn_ids) if pattern.related_txn_ids else None),
+                 json.dumps(pattern.detection_rule, separators=_JSON_SEPARATORS) if pattern.detection_rule else None,
+                 json.dumps(pattern.stats, separators=_JSON_SEPARATORS) if pattern.stats else None,
+                 json.dumps(pattern.related_txn_ids, separators=_JSON_SEPARATORS) if pattern.related_txn_ids else None,
+                 sig),
+            )
+            match_rows.extend(
+                (pattern.pattern_id, txn_id, matched_at)
+                for txn_id in pattern.related_txn_ids or ()
             )
-            new_count += 1
 
+    # One prepared statement for the whole batch, one commit
+    if new_rows:
+        await db.executemany(
+            """INSERT INTO pattern_cards
+               (pattern_id, name, description, discovered_at, status, pattern_type,
+                confidence, detection_rule, stats, related_txn_ids, structural_sig)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            new_rows,
+        )
+    if match_rows:
+        await db.executemany(
+            """INSERT OR IGNORE INTO txn_pattern_matches (pattern_id, txn_id, matched_at)
+               VALUES (?, ?, ?)""",
+            match_rows,
+        )
     await db.commit()
     return patterns
@@ -0,0 +1,143 @@
+"""Micro-batching front end for the risk scorer.
+
+Concurrent /transactions requests each need one model call. Instead of
+calling predict_proba once per request, submissions are queued and a
+background task drains them in small batches (up to MAX_BATCH, waiting at
+most MAX_WAIT_MS after the first arrival) and scores each batch with one
+vectorized call. Under light load a batch is a single transaction and the
+only added latency is the wait window.
+"""
+import asyncio
+import logging
+
+from risk.scorer import ModelMissingError, RiskResult, score_transactions
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH = 64
+MAX_WAIT_MS = 10
+
+
+class ScoreBatcher:
+    """Coalesce concurrent score requests into vectorized model calls."""
+
+    def __init__(self, max_batch: int = MAX_BATCH, max_wait_ms: float = MAX_WAIT_MS):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: asyncio.Queue[tuple[dict, asyncio.Future]] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+        # The batch currently being scored (handed to the executor)
+        self._in_flight: list[tuple[dict, asyncio.Future]] = []
+
+    async def submit(self, txn: dict) -> RiskResult:
+        """Queue a transaction for scoring and wait for its result.
+
+        Raises RuntimeError (model missing / scoring failed) like score_transaction.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((txn, future))
+        return await future
+
+    async def close(self):
+        """Stop the drain task.
+
+        Submissions still queued are cancelled; those in the batch being
+        scored fail with RuntimeError, so no submit() caller is left waiting.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for _, future in self._in_flight:
+            if not future.done():
+                future.set_exception(RuntimeError("Scoring stopped: batcher closed"))
+        self._in_flight = []
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            future.cancel()
+
+    async def _collect(self) -> list[tuple[dict, asyncio.Future]]:
+        """Block for the first item, then gather more until the batch or window is full."""
+        batch = [await self._queue.get()]
+        # Tracked from the first dequeue, so close() also reaches a batch
+        # that is still filling
+        self._in_flight = batch
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # Requests whose caller went away (client disconnect) are skipped
+            batch = [(txn, future) for txn, future in batch if not future.done()]
+            if not batch:
+                continue
+            self._in_flight = batch
+            txns = [txn for txn, _ in batch]
+            try:
+                # numpy / xgboost work runs off the event loop; the next batch
+                # keeps filling the queue meanwhile.
+                results = await loop.run_in_executor(None, score_transactions, txns)
+            except Exception as exc:
+                if len(batch) == 1 or isinstance(exc, ModelMissingError):
+                    # A missing model fails every item alike; retrying each
+                    # one would only repeat the same error
+                    results = [exc] * len(batch)
+                else:
+                    # Score individually so one bad input can't fail its neighbours
+                    logger.warning("Batched scoring failed for %d txns, retrying one by one", len(batch))
+                    results = []
+                    for txn in txns:
+                        try:
+                            results.append((await loop.run_in_executor(None, score_transactions, [txn]))[0])
+                        except Exception as item_exc:
+                            results.append(item_exc)
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+            self._in_flight = []
+
+
+_batcher: ScoreBatcher | None = None
+_batcher_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_score_batcher() -> ScoreBatcher:
+    """Get the batcher for the running event loop, creating it lazily.
+
+    Its queue and drain task belong to one loop, so a fresh batcher is
+    built when called from a different loop (e.g. tests).
+    """
+    global _batcher, _batcher_loop
+    loop = asyncio.get_running_loop()
+    if _batcher is None or _batcher_loop is not loop:
+        _batcher = ScoreBatcher()
+        _batcher_loop = loop
+    return _batcher
+
+
+async def close_score_batcher():
+    """Stop the batcher's drain task (call on app shutdown)."""
+    global _batcher, _batcher_loop
+    if _batcher is not None:
+        await _batcher.close()
+    _batcher = None
+    _batcher_loop = None
@@ -10,10 +10,12 @@ Architecture:
 - Streaming: Supports token-by-token streaming for live UI feedback
 """
 import logging
+import threading
 import time
 from datetime import datetime
 
 import httpx
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -174,6 +176,35 @@ PATTERN CONTEXT: Explain matched pattern connection, or state "No pattern matche
 RECOMMENDATION: BLOCK, REVIEW, or APPROVE with 1-2 specific next steps for the analyst."""
 
 
+# --- Shared HTTP client ---
+# One keep-alive connection pool for the blocking Ollama calls (explainer,
+# guardian) instead of a fresh TCP connection per request. httpx.Client is
+# safe to share across the executor threads these calls run on.
+_http_client: httpx.Client | None = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """Get the shared Ollama HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = httpx.Client(
+                    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                )
+    return _http_client
+
+
+def close_http_client():
+    """Close the shared HTTP client (call on app shutdown)."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+
+
 def _ollama_available() -> bool:
     """Check circuit breaker — skip Ollama if it failed recently."""
     global _cb_last_failure
@@ -194,7 +225,7 @@ def _call_ollama(prompt: str) -> str | None:
     if not _ollama_available():
         return None
     try:
-        resp = httpx.post(
+        resp = get_http_client().post(
             f"{OLLAMA_URL}/api/generate",
             json={
                 "model": OLLAMA_MODEL,
@@ -288,47 +319,50 @@ def _multi_agent_explain(prompt: str) -> str | None:
     return _call_ollama(synth_prompt)
 
 
-def _call_ollama_stream(prompt: str):
+async def _call_ollama_stream(prompt: str):
     """Call Ollama API with streaming enabled, yielding chunks.
 
-    Yields (chunk_text, is_done) tuples. Returns gracefully on failure.
+    Async generator of (chunk_text, is_done) tuples. It reads the response
+    on the event loop through httpx.AsyncClient, so chunks reach the caller
+    without a worker thread and queue in between. Returns gracefully on failure.
     Pattern stolen from AgentCore's @app.entrypoint streaming pattern.
     """
     if not _ollama_available():
         return
     try:
-        with httpx.stream(
-            "POST",
-            f"{OLLAMA_URL}/api/generate",
-            json={
-                "model": OLLAMA_MODEL,
-                "prompt": prompt,
-                "stream": True,
-                "options": {
-                    "temperature": 0.2,
-                    "num_predict": 350,
-                    "top_p": 0.9,
-                    "repeat_penalty": 1.1,
-                },
-            },
+        async with httpx.AsyncClient(
             timeout=httpx.Timeout(connect=3.0, read=OLLAMA_TIMEOUT, write=5.0, pool=5.0),
-        ) as resp:
-            if resp.status_code != 200:
-                return
-            import json as _json
-            for line in resp.iter_lines():
-                if not line:
-                    continue
-                try:
-                    data = _json.loads(line)
+        ) as client:
+            async with client.stream(
+                "POST",
+                f"{OLLAMA_URL}/api/generate",
+                json={
+                    "model": OLLAMA_MODEL,
+                    "prompt": prompt,
+                    "stream": True,
+                    "options": {
+                        "temperature": 0.2,
+                        "num_predict": 350,
+                        "top_p": 0.9,
+                        "repeat_penalty": 1.1,
+                    },
+                },
+            ) as resp:
+                if resp.status_code != 200:
+                    return
+                async for line in resp.aiter_lines():
+                    if not line:
+                        continue
+                    try:
+                        data = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        continue
                     chunk = data.get("response", "")
                     done = data.get("done", False)
                     if chunk:
                         yield chunk, done
                     if done:
                         return
-                except _json.JSONDecodeError:
-                    continue
     except (httpx.ConnectError, httpx.ConnectTimeout, httpx.ReadTimeout):
         _mark_ollama_down()
     except Exception as e:
@@ -313,7 +313,7 @@ def _call_guardian_llm(prompt: str) -> str | None:
     Uses same circuit-breaker + fast connect timeout as explainer.py
     to prevent blocking the event loop when Ollama is unreachable.
     """
-    from risk.explainer import _ollama_available, _mark_ollama_down
+    from risk.explainer import _mark_ollama_down, _ollama_available, get_http_client
 
     if not _ollama_available():
         logger.debug("Guardian LLM skipped — circuit breaker open")
@@ -321,7 +321,7 @@ def _call_guardian_llm(prompt: str) -> str | None:
 
     settings = get_settings()
     try:
-        resp = httpx.post(
+        resp = get_http_client().post(
             f"{settings.OLLAMA_URL}/api/generate",
             json={
                 "model": settings.OLLAMA_MODEL,
@@ -372,7 +372,7 @@ async def _log_decision(
             datetime.utcnow().isoformat(),
             decision_type,
             reasoning,
-            json.dumps(context),
+            json.dumps(context, separators=(",", ":")),
             outcome,
             model_version_before,
             model_version_after,
@@ -442,7 +442,7 @@ async def _guardian_tick(
     retrain_fn: Callable[..., Awaitable[dict]],
 ):
     """Single guardian check cycle."""
-    from backend.db import get_db
+    from backend.db import SNAPSHOT_INSERT_SQL, get_db, to_json
     from risk.scorer import reload_model
 
     async with get_db() as db:
@@ -570,10 +570,8 @@ async def _guardian_tick(
         async with get_db() as db:
             snapshot_id = str(uuid4())
             await db.execute(
-                """INSERT INTO metric_snapshots (snapshot_id, timestamp, model_version, metrics)
-                   VALUES (?, ?, ?, ?)""",
-                (snapshot_id, datetime.utcnow().isoformat(), new_version,
-                 json.dumps(new_metrics)),
+                SNAPSHOT_INSERT_SQL,
+                (snapshot_id, datetime.utcnow().isoformat(), new_version, to_json(new_metrics)),
             )
             await _log_decision(
                 db,
@@ -6,6 +6,8 @@ import math
 import threading
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
 from uuid import uuid4
 
 
@@ -22,6 +24,10 @@ class RiskResult:
     uncertainty: float = 0.0
 
 
+class ModelMissingError(RuntimeError):
+    """No ML model is loaded, so nothing can be scored."""
+
+
 # Thresholds (will be updated by learning loop)
 THRESHOLDS = {
     "review": 0.5,  # score >= 0.5 -> review
@@ -243,25 +249,53 @@ def reload_model():
         _model_state["version"] = new_version
 
 
+@lru_cache(maxsize=1)
+def _feature_vectorizer():
+    """Build a C-level getter that pulls features out in FEATURE_NAMES order.
+
+    compute_features() always returns every FEATURE_NAMES key, so the
+    per-name dict.get loop can be a single itemgetter call.
+    """
+    from risk.trainer import FEATURE_NAMES
+    return itemgetter(*FEATURE_NAMES)
+
+
 def score_transaction(txn: dict) -> RiskResult:
     """Score a transaction for fraud risk.
 
     Uses ML model if available, falls back to weighted features (rule-based).
     """
-    features = compute_features(txn)
+    return score_transactions([txn])[0]
+
+
+def score_transactions(txns: list[dict]) -> list[RiskResult]:
+    """Score several transactions with a single vectorized model call.
+
+    Results are returned in input order. Used by the micro-batcher so
+    concurrent requests share one predict_proba call.
+    """
+    all_features = [compute_features(txn) for txn in txns]
 
     # ML model is mandatory
     ml_model, model_version = _get_ml_model()
     if ml_model is None:
-        raise RuntimeError("ML model missing. Train or bootstrap before scoring.")
+        raise ModelMissingError("ML model missing. Train or bootstrap before scoring.")
 
-    from risk.trainer import FEATURE_NAMES
-    feature_vector = [features.get(name, 0.0) for name in FEATURE_NAMES]
+    vectorize = _feature_vectorizer()
+    matrix = [vectorize(features) for features in all_features]
     try:
-        score = float(ml_model.predict_proba([feature_vector])[0][1])
+        scores = ml_model.predict_proba(matrix)[:, 1]
     except Exception as exc:
         raise RuntimeError("ML scoring failed. Check model integrity.") from exc
 
+    return [
+        _build_result(txn, features, float(score), model_version)
+        for txn, features, score in zip(txns, all_features, scores)
+    ]
+
+
+def _build_result(txn: dict, features: dict, score: float, model_version: str) -> RiskResult:
+    """Turn a raw model probability into a RiskResult (decision, reasons, uncertainty)."""
     # Clamp to [0, 1]
     score = max(0.0, min(1.0, score))
 
@@ -1,4 +1,5 @@
 """Pipeline smoke tests."""
+import asyncio
 from pathlib import Path
 
 import numpy as np
@@ -252,6 +253,47 @@ class TestRiskScoringPipeline:
         assert 0 <= result.uncertainty <= 0.5
         assert result.uncertainty == round(abs(result.score - 0.5), 4)
 
+    @pytest.mark.asyncio
+    async def test_score_batcher_matches_single_scoring(self):
+        """Concurrent batched submissions should score exactly like score_transaction."""
+        from risk.batcher import ScoreBatcher
+        from risk.scorer import score_transaction
+
+        txns = [
+            {"txn_id": f"batch_{i}", "amount": 100.0 * (i + 1), "currency": "USD",
+             "sender_id": f"batch_sender_{i}", "receiver_id": "batch_receiver",
+             "txn_type": "transfer" if i % 2 else "payment", "channel": "web"}
+            for i in range(10)
+        ]
+        batcher = ScoreBatcher(max_batch=4)
+        try:
+            results = await asyncio.gather(*(batcher.submit(t) for t in txns))
+        finally:
+            await batcher.close()
+
+        for txn, result in zip(txns, results):
+            assert result.txn_id == txn["txn_id"]
+            assert result.score == score_transaction(txn).score
+
+    @pytest.mark.asyncio
+    async def test_score_batcher_close_fails_pending_batch(self):
+        """Closing the batcher should fail a dequeued batch instead of leaving callers waiting."""
+        from risk.batcher import ScoreBatcher
+
+        batcher = ScoreBatcher(max_wait_ms=5000)
+        pending = asyncio.ensure_future(batcher.submit({
+            "txn_id": "closing_batch", "amount": 100.0, "currency": "USD",
+            "sender_id": "closing_sender", "receiver_id": "closing_receiver",
+            "txn_type": "transfer", "channel": "web",
+        }))
+        # Let the drain task dequeue it and start waiting for a fuller batch
+        for _ in range(5):
+            await asyncio.sleep(0)
+        await batcher.close()
+
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(pending, timeout=1)
+
     @pytest.mark.asyncio
     async def test_api_returns_risk_score(self):
         """POST /transactions should return a real risk_score (not None)."""
@@ -337,6 +379,117 @@ class TestRiskScoringPipeline:
             assert metrics["total_txns"] >= 1
             assert metrics["flagged_txns"] >= 1
 
+    @pytest.mark.asyncio
+    async def test_metrics_counters_match_tables(self):
+        """Trigger-maintained /metrics counts should equal real table counts."""
+        from httpx import ASGITransport, AsyncClient
+
+        from backend.db import fetch_one, get_db
+        from backend.main import app
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.post("/transactions", json={
+                "amount": 40000,
+                "currency": "USD",
+                "sender_id": "counter_sender",
+                "receiver_id": "counter_receiver",
+                "txn_type": "transfer",
+            })
+            assert resp.status_code == 200
+
+            async with get_db() as db:
+                row = await fetch_one(
+                    db, "SELECT case_id FROM cases WHERE status = 'open' LIMIT 1",
+                )
+            if row:
+                resp = await client.post(f"/cases/{row[0]}/label", json={"decision": "fraud"})
+                assert resp.status_code == 200
+
+            metrics = (await client.get("/metrics")).json()
+
+        async with get_db() as db:
+            expected = await fetch_one(
+                db,
+                """SELECT (SELECT COUNT(*) FROM transactions),
+                          (SELECT COUNT(*) FROM risk_results WHERE flagged = 1),
+                          (SELECT COUNT(*) FROM cases WHERE status IN ('open', 'in_review')),
+                          (SELECT COUNT(*) FROM cases WHERE status = 'closed')""",
+            )
+        assert (
+            metrics["total_txns"], metrics["flagged_txns"],
+            metrics["cases_open"], metrics["cases_closed"],
+        ) == tuple(expected)
+
+    @pytest.mark.asyncio
+    async def test_ingest_writes_transaction_risk_and_case_rows(self):
+        """One txn_ingest insert should fan out to transactions, risk_results and cases."""
+        import json
+
+        from httpx import ASGITransport, AsyncClient
+
+        from backend.db import fetch_one, get_db
+        from backend.main import app
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.post("/transactions", json={
+                "amount": 42000,
+                "currency": "EUR",
+                "sender_id": "ingest_sender",
+                "receiver_id": "ingest_receiver",
+                "txn_type": "transfer",
+                "channel": "api",
+                "ip_address": "10.0.0.7",
+                "device_id": "ingest_device",
+                "is_fraud_ground_truth": True,
+                "metadata": {"fraud_type": "structuring"},
+            })
+            assert resp.status_code == 200
+            data = resp.json()
+
+        async with get_db() as db:
+            txn = await fetch_one(
+                db,
+                """SELECT timestamp, amount, currency, sender_id, receiver_id, txn_type, channel,
+                          ip_address, device_id, is_fraud_ground_truth, metadata, ts_epoch
+                   FROM transactions WHERE txn_id = ?""",
+                (data["txn_id"],),
+            )
+            risk = await fetch_one(
+                db,
+                "SELECT risk_score, flagged, model_version, features FROM risk_results WHERE txn_id = ?",
+                (data["txn_id"],),
+            )
+            case = await fetch_one(
+                db,
+                "SELECT status, created_at, priority, risk_score FROM cases WHERE txn_id = ?",
+                (data["txn_id"],),
+            )
+
+        assert txn is not None
+        assert tuple(txn[:10]) == (
+            data["timestamp"], 42000, "EUR", "ingest_sender", "ingest_receiver",
+            "transfer", "api", "10.0.0.7", "ingest_device", 1,
+        )
+        assert json.loads(txn[10]) == {"fraud_type": "structuring"}
+        assert txn[11] is not None
+
+        assert risk is not None
+        assert risk[0] == pytest.approx(data["risk_score"])
+        assert risk[1] == (0 if data["decision"] == "approve" else 1)
+        assert risk[2]
+        assert json.loads(risk[3])
+
+        if data["decision"] == "approve":
+            assert case is None
+        else:
+            assert case is not None
+            assert tuple(case[:3]) == (
+                "open", data["timestamp"], "high" if data["decision"] == "block" else "medium",
+            )
+            assert case[3] == pytest.approx(data["risk_score"])
+
     @pytest.mark.asyncio
     async def test_suggested_cases_endpoint(self):
         """GET /cases/suggested should return cases sorted by uncertainty."""
@@ -371,6 +524,36 @@ class TestRiskScoringPipeline:
                 for j in range(len(cases) - 1):
                     assert cases[j]["uncertainty"] <= cases[j + 1]["uncertainty"]
 
+    @pytest.mark.asyncio
+    async def test_pattern_search_matches_entity_id(self):
+        """GET /patterns?q= should full-text match whole entity IDs only."""
+        from uuid import uuid4
+
+        from httpx import ASGITransport, AsyncClient
+
+        from backend.db import get_db
+        from backend.main import app
+
+        pattern_id = str(uuid4())
+        async with get_db() as db:
+            await db.execute(
+                """INSERT INTO pattern_cards (pattern_id, name, description, discovered_at, status)
+                   VALUES (?, ?, ?, ?, 'active')""",
+                (pattern_id, "Fan-out hub", "Account fts_hub_0042 sent to 9 unique receivers.",
+                 "2026-01-01T00:00:00"),
+            )
+            await db.commit()
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.get("/patterns", params={"q": "fts_hub_0042"})
+            assert resp.status_code == 200
+            assert pattern_id in [p["pattern_id"] for p in resp.json()]
+
+            resp = await client.get("/patterns", params={"q": "fts_hub_004"})
+            assert resp.status_code == 200
+            assert pattern_id not in [p["pattern_id"] for p in resp.json()]
+
 
 class TestPatternFeatures:
     """Test pattern-derived features module."""
@@ -403,3 +586,115 @@ class TestPatternFeatures:
         assert feats["sender_in_ring"] == 0.0
         assert "pattern_count_sender" in feats
         assert feats["pattern_count_sender"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_pattern_index_refreshes_on_card_change(self):
+        """The cached pattern index should pick up card inserts and status changes."""
+        from uuid import uuid4
+
+        from backend.db import get_db, init_db_tables
+        from patterns.features import compute_pattern_features
+
+        await init_db_tables()
+        sender = f"ring_member_{uuid4().hex[:8]}"
+        pattern_id = str(uuid4())
+        async with get_db() as db:
+            assert (await compute_pattern_features(db, sender, "nobody"))["sender_in_ring"] == 0.0
+
+            await db.execute(
+                """INSERT INTO pattern_cards
+                   (pattern_id, name, description, discovered_at, status, pattern_type, detection_rule)
+                   VALUES (?, 'Ring', 'Test ring', '2026-01-01T00:00:00', 'active', 'graph', ?)""",
+                (pattern_id, '{"type": "cycle", "member_ids": ["%s"]}' % sender),
+            )
+            await db.commit()
+            assert (await compute_pattern_features(db, sender, "nobody"))["sender_in_ring"] == 1.0
+
+            await db.execute(
+                "UPDATE pattern_cards SET status = 'retired' WHERE pattern_id = ?", (pattern_id,),
+            )
+            await db.commit()
+            assert (await compute_pattern_features(db, sender, "nobody"))["sender_in_ring"] == 0.0
+
+
+class TestPatternMiner:
+    """Parity checks for the miner's compiled graph and numeric paths."""
+
+    @staticmethod
+    def _ring_and_hub_graph():
+        """A 3-member ring (A->B->C->A) plus a hub H paying six receivers."""
+        from patterns.miner import build_transaction_graph
+
+        txns = [
+            {"txn_id": f"ring_{i}", "sender_id": s, "receiver_id": r, "amount": 10.0,
+             "timestamp": "2026-01-01T00:00:00"}
+            for i, (s, r) in enumerate([("A", "B"), ("B", "C"), ("C", "A")])
+        ]
+        txns += [
+            {"txn_id": f"hub_{i}", "sender_id": "H", "receiver_id": f"R{i}", "amount": 100.0,
+             "timestamp": "2026-01-01T00:00:00"}
+            for i in range(6)
+        ]
+        return build_transaction_graph(txns)
+
+    def test_scc_matches_networkx(self):
+        """scipy-based SCCs should equal networkx's components."""
+        import networkx as nx
+
+        from patterns.miner import strongly_connected_components
+
+        G = self._ring_and_hub_graph()
+        ours = {frozenset(c) for c in strongly_connected_components(G)}
+        assert ours == {frozenset(c) for c in nx.strongly_connected_components(G)}
+        assert frozenset({"A", "B", "C"}) in ours
+
+    def test_hub_score_matches_networkx_hits(self):
+        """detect_hubs' svds HITS score should equal nx.hits for the hub."""
+        import networkx as nx
+
+        from patterns.miner import detect_hubs
+
+        G = self._ring_and_hub_graph()
+        hubs, _ = nx.hits(G, max_iter=100, tol=1e-6)
+        out_hubs = [p for p in detect_hubs(G) if p.detection_rule["type"] == "hub_out"]
+        assert len(out_hubs) == 1
+        assert out_hubs[0].stats["out_degree"] == 6
+        assert out_hubs[0].detection_rule["hub_score"] == pytest.approx(hubs["H"], abs=1e-5)
+
+    @pytest.mark.parametrize("last_offset_s, expected", [(3600, 1), (3601, 0)])
+    def test_velocity_window_boundary_is_inclusive(self, last_offset_s, expected):
+        """Transactions exactly window_minutes apart fall in the same window."""
+        from datetime import datetime, timedelta
+
+        from patterns.miner import detect_velocity_clusters
+
+        start = datetime(2026, 1, 1, 12, 0, 0)
+        offsets = [0, 900, 1800, 2700, last_offset_s]
+        txns = [
+            {"txn_id": f"v{i}", "sender_id": "burst", "receiver_id": f"r{i}", "amount": 50.0,
+             "timestamp": (start + timedelta(seconds=s)).isoformat()}
+            for i, s in enumerate(offsets)
+        ]
+        patterns = detect_velocity_clusters(txns, window_minutes=60, threshold=5)
+        assert len(patterns) == expected
+        if expected:
+            assert patterns[0].stats["txn_count"] == 5
+
+    def test_epoch_seconds_parse_paths_agree(self):
+        """Bulk datetime64 parsing and the fromisoformat fallback give the same epochs."""
+        from datetime import datetime, timezone
+
+        from patterns.miner import _epoch_seconds
+
+        base = datetime(2026, 1, 1, tzinfo=timezone.utc).timestamp()
+        # No offsets: the single datetime64 conversion
+        bulk = _epoch_seconds(["2026-01-01T00:00:00", "2026-01-01T00:00:01.500Z", ""])
+        # An explicit offset and a malformed entry force the per-string fallback
+        fallback = _epoch_seconds([
+            "2026-01-01T00:00:00", "2026-01-01T00:00:01.500Z",
+            "2026-01-01T00:00:02+00:00", "", "not-a-timestamp",
+        ])
+        np.testing.assert_allclose(bulk[:2], [base, base + 1.5])
+        assert np.isnan(bulk[2])
+        np.testing.assert_allclose(fallback[:3], [base, base + 1.5, base + 2])
+        assert np.isnan(fallback[3:]).all()
@@ -243,6 +243,12 @@ class OrbitalDataLayer {
         break;
       }
 
+      case 'patterns': {
+        // One event per mining run; items carry the per-pattern fields
+        for (const item of ev.items || []) this._handleEvent({ type: 'pattern', ...item });
+        break;
+      }
+
       case 'simulator_started':
         this.state.simulatorRunning = true;
         this._addFeedLine('scanner', 'Simulator started');